@@ -1,26 +1,166 @@
-from flask import Flask, render_template, request, redirect, url_for
+from flask import Flask, Response, render_template, request, redirect, url_for, jsonify
+from markupsafe import escape
+import json
 import os
-from werkzeug.utils import secure_filename
+import time
 import resume_extract
-import job_role_prediction
+import resume_pipeline
 import linkdin_jobs
+import job_store
+import metrics
+from task_queue import TaskQueue, QueueFullError
 
-UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf'}
 
 app = Flask(__name__)
 
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+# Uploads are parsed in memory; these bound the size and number of pages read
+app.config['MAX_PDF_BYTES'] = resume_extract.MAX_PDF_BYTES
+app.config['MAX_PDF_PAGES'] = resume_extract.MAX_PDF_PAGES
+# Reject larger request bodies before they are read (room left for the form fields)
+app.config['MAX_CONTENT_LENGTH'] = app.config['MAX_PDF_BYTES'] + 64 * 1024
+# Number of predicted roles searched for each resume
+app.config['TOP_K_ROLES'] = 3
+# Background processing: worker threads, queued + running tasks allowed, seconds results are kept
+app.config['TASK_WORKERS'] = int(os.environ.get('TASK_WORKERS', 4))
+app.config['TASK_QUEUE_SIZE'] = int(os.environ.get('TASK_QUEUE_SIZE', 64))
+app.config['TASK_RESULT_TTL'] = int(os.environ.get('TASK_RESULT_TTL', 600))
+# SQLite file sharing task state and results between server processes (default: the job store's)
+app.config['TASK_STORE_PATH'] = os.environ.get('TASK_STORE_PATH') or job_store.JOB_STORE_PATH
+# The upload form only polls for its result when every server process can answer for the task:
+# with a shared task store, or with a single process serving the app
+app.config['ASYNC_FORM'] = bool(app.config['TASK_STORE_PATH']) or int(os.environ.get('WEB_WORKERS', 1)) <= 1
 
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
+task_queue = TaskQueue(workers=app.config['TASK_WORKERS'],
+                       max_queued=app.config['TASK_QUEUE_SIZE'],
+                       result_ttl=app.config['TASK_RESULT_TTL'],
+                       path=app.config['TASK_STORE_PATH'] or None)
+
+# Stage timers, outbound request metrics and cache ratios on /metrics; METRICS_TRACE_LOG also
+# writes the timed spans of every request as a JSON line
+app.config['METRICS_ENABLED'] = metrics.ENABLED
+app.config['METRICS_TRACE_LOG'] = metrics.TRACE_LOG
+metrics.configure(enabled=app.config['METRICS_ENABLED'], trace_log=app.config['METRICS_TRACE_LOG'] or '')
+metrics.register_collector(lambda: [('tasks', {'state': state}, count)
+                                    for state, count in task_queue.stats()['tasks'].items()])
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# Function to run the whole pipeline for a resume and return the context of the recommendations page.
+# task is the background Task when run from the queue, used to report progress
+def build_recommendations(data, location, top_k, max_pages, task=None):
+    def report(progress, message):
+        if task is not None:
+            task.update(progress, message)
+
+    # Extract resume info and the most likely job roles with their probabilities
+    # (cached by the hash of the PDF, so a resubmitted resume skips this step)
+    with metrics.trace('process', location=location, pdf_bytes=len(data)):
+        report(0.1, 'Reading resume')
+        analysis = resume_pipeline.analyze_resume(data, top_k=top_k, max_pages=max_pages)
+        info = analysis['info']
+        job_roles = analysis['job_roles']
+        job_role = job_roles[0][0]
+
+        # Search jobs for all predicted roles, from the local job store when it can answer
+        report(0.3, 'Searching jobs')
+        with metrics.stage('job_search'):
+            jobs = [job_card(row, job_role) for row in find_jobs(job_roles, location, info)]
+        return dict(profile_context(info, job_roles), jobs=jobs)
+
+# Function to get the top matches from the local job store, or None when it is missing, stale or sparse
+def find_stored_jobs(job_roles, location, info, n=4):
+    store = job_store.get_store()
+    if store is None or not store.is_fresh(job_roles, location):
+        return None
+    rows = store.search(info['Skills'], info['Qualification'], roles=job_roles, location=location, n=n)
+    return rows if len(rows) >= n else None
+
+# Function to find the top matches for the predicted roles, scraping LinkedIn only when the store can't answer
+def find_jobs(job_roles, location, info, n=4):
+    rows = find_stored_jobs(job_roles, location, info, n)
+    if rows is None:
+        jobs_df = linkdin_jobs.linkdin_multi(job_roles, location, info['Skills'], info['Qualification'], n=n)
+        rows = [row for _, row in jobs_df.iterrows()]
+    return rows
+
+# Function to turn a scored posting (DataFrame row or dict) into what the templates show
+def job_card(row, job_role):
+    return {
+        'title': row.get('Job Title', ''),
+        'company': row.get('Company Name', ''),
+        'location': row.get('Location', ''),
+        'description': ', '.join(row.get('Skills', [])),
+        'link': row.get('Apply Link', '#'),
+        'role': row.get('Role', job_role)
+    }
+
+def profile_context(info, job_roles):
+    return dict(name=info['Name'],
+                job_role=job_roles[0][0],
+                job_roles=job_roles,
+                skills=info['Skills'],
+                qualification=info['Qualification'],
+                experience=info['Experience'])
+
+# Function to format one Server-Sent Event
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+# Generator of the streaming response: the extracted profile first, then the top matches each
+# time they improve while postings are still being fetched
+def stream_recommendations(data, location, top_k, max_pages, n=4):
+    with metrics.trace('process_stream', location=location, pdf_bytes=len(data)):
+        yield from _stream_recommendations(data, location, top_k, max_pages, n)
+
+def _stream_recommendations(data, location, top_k, max_pages, n):
+    try:
+        analysis = resume_pipeline.analyze_resume(data, top_k=top_k, max_pages=max_pages)
+        info = analysis['info']
+        job_roles = analysis['job_roles']
+        job_role = job_roles[0][0]
+        yield sse_event('profile', profile_context(info, job_roles))
+
+        rows = find_stored_jobs(job_roles, location, info, n)
+        if rows is not None:
+            yield sse_event('matches', [job_card(row, job_role) for row in rows])
+        else:
+            job_posts = linkdin_jobs.linkdin_multi_stream(job_roles, location, info['Skills'], info['Qualification'])
+            for top in linkdin_jobs.stream_top_matches(job_posts, n=n, user_skills=info['Skills']):
+                yield sse_event('matches', [job_card(job_post, job_role) for job_post in top])
+        yield sse_event('done', {})
+    except Exception as e:
+        metrics.inc('errors_total', stage='process_stream')
+        yield sse_event('error', {'error': str(e) or e.__class__.__name__})
+
+# Background variant of build_recommendations for the task queue
+def recommendation_task(task, data, location, top_k, max_pages):
+    return build_recommendations(data, location, top_k, max_pages, task=task)
+
+def wants_async():
+    return request.values.get('async', '').lower() in ('1', 'true', 'yes', 'on')
+
+def wants_json():
+    best = request.accept_mimetypes.best_match(['application/json', 'text/html'])
+    return best == 'application/json'
+
+@app.before_request
+def start_request_timer():
+    if metrics.ENABLED:
+        request.environ['metrics.started'] = time.perf_counter()
+
+@app.after_request
+def record_request_time(response):
+    started = request.environ.get('metrics.started')
+    if started is not None:
+        metrics.observe('request_seconds', time.perf_counter() - started,
+                        endpoint=request.endpoint or 'unknown', status=response.status_code)
+    return response
+
 @app.route('/', methods=['GET'])
 def upload_page():
-    return render_template('upload.html')
+    return render_template('upload.html', async_form=app.config['ASYNC_FORM'])
 
 @app.route('/process', methods=['POST'])
 def process_resume():
@@ -30,40 +170,79 @@ def process_resume():
     if file.filename == '':
         return 'No selected file', 400
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        # Extract resume info
-        text = resume_extract.extract_text_from_pdf(filepath)
-        info = resume_extract.extract_resume_info(text)
-
-        # Get model predicted job role
-        job_role = job_role_prediction.predict_job_role(info['Skills'],info['Experience'], info['Qualification'])
+        # Read the upload into memory, nothing is written to disk
+        try:
+            data = resume_pipeline.read_pdf_bytes(file.stream, max_bytes=app.config['MAX_PDF_BYTES'])
+        except resume_extract.PDFTooLargeError:
+            return 'File too large.', 413
 
         # For demo, use 'India' as location
         location = request.form.get('location')
 
-        # Search jobs using linkdin_jobs
-        jobs_df = linkdin_jobs.linkdin(job_role, location, info['Skills'], info['Qualification'])
-        jobs = []
-        for _, row in jobs_df.iterrows():
-            jobs.append({
-                'title': row.get('Job Title', ''),
-                'company': row.get('Company Name', ''),
-                'location': row.get('Location', ''),
-                'description': ', '.join(row.get('Skills', [])),
-                'link': row.get('Apply Link', '#')
-            })
-        return render_template('recommendations.html',
-                               name=info['Name'],
-                               job_role=job_role,
-                               skills=info['Skills'],
-                               qualification=info['Qualification'],
-                               experience=info['Experience'],
-                               jobs=jobs)
+        args = (data, location, app.config['TOP_K_ROLES'], app.config['MAX_PDF_PAGES'])
+
+        if wants_async():
+            # Queue the work and answer straight away with the task id
+            try:
+                task_id = task_queue.submit(recommendation_task, *args)
+            except QueueFullError:
+                return 'Server busy, try again later.', 503
+            urls = {'task_id': task_id,
+                    'status_url': url_for('task_status', task_id=task_id),
+                    'result_url': url_for('task_result', task_id=task_id)}
+            if wants_json():
+                return jsonify(urls), 202
+            return render_template('processing.html', **urls), 202
+
+        return render_template('recommendations.html', **build_recommendations(*args))
     else:
         return 'Invalid file type. Only PDF allowed.', 400
 
+# Streaming variant of /process: Server-Sent Events with the profile, then the improving top matches
+@app.route('/process/stream', methods=['POST'])
+def process_resume_stream():
+    if 'resume' not in request.files:
+        return 'No file part', 400
+    file = request.files['resume']
+    if file.filename == '' or not allowed_file(file.filename):
+        return 'Invalid file type. Only PDF allowed.', 400
+    try:
+        data = resume_pipeline.read_pdf_bytes(file.stream, max_bytes=app.config['MAX_PDF_BYTES'])
+    except resume_extract.PDFTooLargeError:
+        return 'File too large.', 413
+    location = request.form.get('location')
+
+    events = stream_recommendations(data, location, app.config['TOP_K_ROLES'], app.config['MAX_PDF_PAGES'])
+    return Response(events, mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/status/<task_id>', methods=['GET'])
+def task_status(task_id):
+    status = task_queue.status(task_id)
+    if status is None:
+        return jsonify({'error': 'Unknown task'}), 404
+    return jsonify(status)
+
+@app.route('/result/<task_id>', methods=['GET'])
+def task_result(task_id):
+    task = task_queue.get(task_id)
+    if task is None:
+        return 'Unknown or expired task.', 404
+    if task.state == 'failed':
+        return f'Processing failed: {escape(task.error)}', 500
+    if task.state != 'done':
+        return jsonify(task.status()), 202
+    return render_template('recommendations.html', **task.result)
+
+# Prometheus scrape endpoint, only served when metrics are enabled
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    if not metrics.ENABLED:
+        return 'Metrics are disabled.', 404
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
+    import refresher
+    if refresher.REFRESH_IN_APP:
+        refresher.start_in_app()
     app.run()
@@ -0,0 +1,199 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import resume_extract
+import job_role_prediction
+from keyword_matcher import get_matcher
+
+# Columns of the output file, in order
+OUTPUT_FIELDS = ["path", "name", "skills", "qualification", "experience", "job_role", "job_roles", "error"]
+
+
+# Function to list the PDFs under a directory, sorted so runs are reproducible
+def find_pdfs(directory, recursive=True):
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        paths.extend(os.path.join(root, name) for name in sorted(files) if name.lower().endswith(".pdf"))
+        if not recursive:
+            break
+    return paths
+
+
+# Worker start-up: build the keyword matchers once per process instead of once per resume
+def init_worker():
+    get_matcher(resume_extract.skill_keywords)
+    get_matcher(resume_extract.qualification_keywords)
+
+
+# Function run in the workers: parse one PDF, returning (path, info, error)
+def extract_file(path, max_pages=resume_extract.MAX_PDF_PAGES, max_bytes=resume_extract.MAX_PDF_BYTES):
+    try:
+        # Each worker is already a process of its own, so pages are not fanned out any further
+        text = resume_extract.extract_text_from_pdf(path, max_pages=max_pages, max_bytes=max_bytes, workers=1)
+        return path, resume_extract.extract_resume_info(text), None
+    except Exception as e:
+        return path, None, str(e) or e.__class__.__name__
+
+
+# Function to predict the roles of a batch of extracted resumes with one model call
+def predict_batch(extracted, top_k=3):
+    parsed = [(path, info) for path, info, error in extracted if error is None]
+    job_roles = job_role_prediction.predict_top_job_roles_batch([info for _, info in parsed], k=top_k)
+    roles_by_path = {path: roles for (path, _), roles in zip(parsed, job_roles)}
+
+    rows = []
+    for path, info, error in extracted:
+        row = {"path": path, "error": error}
+        if error is None:
+            roles = roles_by_path[path]
+            row.update({
+                "name": info["Name"],
+                "skills": info["Skills"],
+                "qualification": info["Qualification"],
+                "experience": info["Experience"],
+                "job_role": roles[0][0] if roles else None,
+                "job_roles": [[role, round(probability, 4)] for role, probability in roles],
+            })
+        rows.append(row)
+    return rows
+
+
+# Function to cut off a last line left unfinished by an interrupted run, so appending starts on a fresh line
+def drop_partial_line(path):
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+# Writes result rows as JSON lines or CSV, appending to what an earlier run left behind
+class ResultWriter:
+    def __init__(self, path, fmt):
+        self.fmt = fmt
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "a", newline="", encoding="utf-8")
+        if fmt == "csv":
+            self.csv = csv.DictWriter(self.file, fieldnames=OUTPUT_FIELDS)
+            if new_file:
+                self.csv.writeheader()
+
+    def write(self, row):
+        row = {field: row.get(field) for field in OUTPUT_FIELDS}
+        if self.fmt == "csv":
+            row["skills"] = "; ".join(row["skills"] or [])
+            row["qualification"] = "; ".join(row["qualification"] or [])
+            row["job_roles"] = "; ".join(f"{role}:{probability}" for role, probability in row["job_roles"] or [])
+            self.csv.writerow(row)
+        else:
+            self.file.write(json.dumps(row) + "\n")
+
+    def flush(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+# Function to read the paths an earlier run already wrote, so they can be skipped
+def completed_paths(path, fmt):
+    if not os.path.exists(path):
+        return set()
+    done = set()
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            done.update(row["path"] for row in csv.DictReader(f) if row.get("path"))
+        else:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["path"])
+                except (ValueError, KeyError, TypeError):
+                    # A line cut short by an interrupted run; that resume is processed again
+                    continue
+    return done
+
+
+def output_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+# Function to process every PDF of a directory. Parsing is spread over a process pool; every
+# batch_size parsed resumes are predicted together and written before the next batch
+def run(directory, output, fmt=None, workers=None, top_k=3, batch_size=64, max_pages=resume_extract.MAX_PDF_PAGES,
+        recursive=True, resume=True, progress=sys.stderr):
+    fmt = output_format(output, fmt)
+    if not resume and os.path.exists(output):
+        os.remove(output)
+
+    paths = find_pdfs(directory, recursive)
+    drop_partial_line(output)
+    done = completed_paths(output, fmt) if resume else set()
+    todo = [path for path in paths if path not in done]
+    total = len(todo)
+    if progress:
+        print(f"{len(paths)} PDFs found, {len(paths) - total} already done, {total} to process", file=progress)
+    if not todo:
+        return {"total": len(paths), "processed": 0, "failed": 0, "skipped": len(paths)}
+
+    # Load the model in this process before the workers start, so it is loaded only once
+    job_role_prediction.feature_layout()
+
+    started = time.time()
+    processed = failed = 0
+    writer = ResultWriter(output, fmt)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+            pending = []
+            results = executor.map(extract_file, todo, [max_pages] * total, chunksize=max(1, min(8, total // 64)))
+            for extracted in results:
+                pending.append(extracted)
+                if len(pending) < batch_size and processed + len(pending) < total:
+                    continue
+
+                for row in predict_batch(pending, top_k):
+                    writer.write(row)
+                    failed += row["error"] is not None
+                writer.flush()
+                processed += len(pending)
+                pending = []
+
+                if progress:
+                    elapsed = time.time() - started
+                    print(f"[{processed}/{total}] {processed / elapsed:.1f} resumes/s, {failed} failed", file=progress)
+    finally:
+        writer.close()
+
+    return {"total": len(paths), "processed": processed, "failed": failed, "skipped": len(paths) - total,
+            "seconds": time.time() - started}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract and predict job roles for every PDF resume in a directory")
+    parser.add_argument("directory", help="directory with the PDF resumes")
+    parser.add_argument("-o", "--output", required=True, help="output file (.jsonl or .csv)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="output format (default: from the file extension)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="parser processes (default: one per CPU)")
+    parser.add_argument("-k", "--top-k", type=int, default=3, help="predicted roles per resume")
+    parser.add_argument("--batch-size", type=int, default=64, help="resumes predicted and written together")
+    parser.add_argument("--max-pages", type=int, default=resume_extract.MAX_PDF_PAGES)
+    parser.add_argument("--no-recursive", action="store_true", help="don't descend into subdirectories")
+    parser.add_argument("--restart", action="store_true", help="overwrite the output instead of skipping done resumes")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        parser.error(f"not a directory: {args.directory}")
+
+    summary = run(args.directory, args.output, fmt=args.format, workers=args.workers, top_k=args.top_k,
+                  batch_size=args.batch_size, max_pages=args.max_pages, recursive=not args.no_recursive,
+                  resume=not args.restart)
+    print(json.dumps(summary), file=sys.stderr)
@@ -0,0 +1,86 @@
+"""Benchmark skill/qualification extraction on the recorded job posting fixtures.
+
+Compares the old path (full spaCy pipeline on every text, once for skills and
+once for qualifications) with the current one (one keyword scan per posting).
+
+    python benchmarks/bench_skill_extraction.py [--repeat 20]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bs4 import BeautifulSoup
+
+import linkdin_jobs
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures", "postings")
+
+
+# The extraction as it was before: the spaCy pipeline runs on every text of every category
+def legacy_extract(nlp, job_data, known_keywords):
+    found = set()
+    for category, texts in job_data.items():
+        for text in texts:
+            doc = nlp(text)
+            for token in doc:
+                if token.text in known_keywords:
+                    found.add(token.text)
+            for phrase in known_keywords:
+                if phrase.lower() in text.lower():
+                    found.add(phrase)
+    return sorted(found)
+
+
+def load_job_data():
+    job_data = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            job_data.append(linkdin_jobs.extract_job_details(BeautifulSoup(f.read(), "html.parser")))
+    return job_data
+
+
+def load_nlp():
+    import spacy
+    try:
+        return spacy.load("en_core_web_sm"), "en_core_web_sm"
+    except OSError:
+        # Without the model only the tokenizer runs, so the legacy timing is a lower bound
+        return spacy.blank("en"), "spacy.blank('en') (en_core_web_sm not installed)"
+
+
+def timed(func, postings, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for job_data in postings:
+            func(job_data)
+    return (time.perf_counter() - start) / (repeat * len(postings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    postings = load_job_data()
+    nlp, nlp_name = load_nlp()
+
+    def legacy(job_data):
+        legacy_extract(nlp, job_data, linkdin_jobs.known_tech_skills)
+        legacy_extract(nlp, job_data, linkdin_jobs.known_tech_qualifications)
+
+    legacy_time = timed(legacy, postings, max(1, args.repeat // 10))
+    fast_time = timed(linkdin_jobs.extract_skills_and_qualifications, postings, args.repeat)
+
+    print(f"{len(postings)} postings, legacy pipeline: {nlp_name}")
+    print(f"legacy spaCy path: {legacy_time * 1000:8.3f} ms/posting")
+    print(f"single-pass path:  {fast_time * 1000:8.3f} ms/posting")
+    print(f"speedup:           {legacy_time / fast_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Local HTTP server replaying the recorded LinkedIn fixtures, so the scraper runs offline.
+
+Search requests get fixtures/search/page_<n>.html for start=n*10 (an empty page past the last
+one) and posting requests get fixtures/postings/<job id>.html.
+"""
+import glob
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixtures(fixtures_dir=FIXTURES):
+    search_pages = {}
+    for path in glob.glob(os.path.join(fixtures_dir, "search", "page_*.html")):
+        with open(path, encoding="utf-8") as f:
+            search_pages[int(os.path.basename(path)[5:-5])] = f.read()
+    postings = {}
+    for path in glob.glob(os.path.join(fixtures_dir, "postings", "*.html")):
+        with open(path, encoding="utf-8") as f:
+            postings[os.path.basename(path)[:-5]] = f.read()
+    return search_pages, postings
+
+
+def make_handler(search_pages, postings):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            status = 200
+            if "/jobPosting/" in url.path:
+                body = postings.get(url.path.rsplit("/", 1)[1])
+                if body is None:
+                    status, body = 404, "Not found"
+            else:
+                start = int(parse_qs(url.query).get("start", ["0"])[0])
+                body = search_pages.get(start // 10, "")
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return FixtureHandler
+
+
+# Function to start the server in a daemon thread; returns (server, base_url)
+def serve(fixtures_dir=FIXTURES):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(*load_fixtures(fixtures_dir)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
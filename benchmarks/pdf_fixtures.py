@@ -0,0 +1,75 @@
+"""Synthetic PDF resumes for the benchmarks, written without any PDF library.
+
+    make_pdf([["line", ...], ...])       one list of text lines per page
+    synthetic_resume(pages=3, seed=0)    a resume of the given number of pages
+"""
+import random
+
+SKILLS = ["Python", "Java", "JavaScript", "React", "Node.js", "SQL", "MongoDB", "Docker", "Kubernetes", "AWS",
+          "Azure", "Git", "Linux", "Machine Learning", "Pandas", "NumPy", "TensorFlow", "Flask", "Django",
+          "HTML", "CSS", "Power BI", "Tableau", "C++", "Spark"]
+DEGREES = ["BTech in Computer Science", "B.Sc in Information Technology", "MCA", "M.Sc in Data Science",
+           "Bachelor of Engineering in Electronics"]
+FILLER = [
+    "Designed and shipped features used by thousands of customers every day.",
+    "Improved the latency of core services by profiling and removing hot spots.",
+    "Worked with product and design to scope, estimate and deliver projects on time.",
+    "Wrote unit and integration tests and kept the build green for the whole team.",
+    "Mentored interns and reviewed code for correctness, clarity and performance.",
+    "Automated deployments and monitoring, cutting the time to release from days to hours.",
+]
+LINES_PER_PAGE = 50
+
+
+# Function to write a minimal PDF with one Helvetica text object per page
+def make_pdf(pages):
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>",
+               f"<< /Type /Pages /Kids [{' '.join(f'{4 + 2 * i} 0 R' for i in range(len(pages)))}] /Count {len(pages)} >>",
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    for i, lines in enumerate(pages):
+        parts = ["BT", "/F1 10 Tf", "14 TL", "50 800 Td"]
+        for line in lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            parts.append(f"({escaped}) Tj T*")
+        parts.append("ET")
+        stream = "\n".join(parts)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>")
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+# Function to build the pages of a resume: a header page followed by pages of project history
+def resume_pages(pages=1, seed=0):
+    r = random.Random(seed)
+    skills = r.sample(SKILLS, r.randint(6, 12))
+    start_year = r.randint(2012, 2020)
+    lines = [
+        f"Candidate {seed}",
+        f"candidate{seed}@example.com | +91 98765 {seed:05d} | Bengaluru, India",
+        "SKILLS",
+        ", ".join(skills),
+        "EDUCATION",
+        f"{r.choice(DEGREES)}, National Institute of Technology, {start_year - 4} - {start_year}",
+        "EXPERIENCE",
+        f"Software Engineer, Acme Corp   Jan {start_year} - Dec {start_year + 2}",
+        f"Senior Software Engineer, Globex   Jan {start_year + 3} - Present",
+    ]
+    while len(lines) < pages * LINES_PER_PAGE:
+        lines.append(f"- {r.choice(FILLER)} Used {r.choice(skills)} and {r.choice(skills)}.")
+    return [lines[i:i + LINES_PER_PAGE] for i in range(0, pages * LINES_PER_PAGE, LINES_PER_PAGE)]
+
+
+def synthetic_resume(pages=1, seed=0):
+    return make_pdf(resume_pages(pages, seed))
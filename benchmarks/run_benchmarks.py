@@ -0,0 +1,252 @@
+"""Offline benchmark suite for the resume and job matching pipeline.
+
+Times PDF text extraction on synthetic resumes of several sizes (per page, for
+each available backend), resume info
+extraction, role prediction (single and batch), posting and search page parsing
+on the recorded LinkedIn fixtures, and the end-to-end /process request through
+the Flask test client against a local server replaying those fixtures.
+
+    python benchmarks/run_benchmarks.py [--repeat 20] [--only pdf_text]
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json [--tolerance 0.2]
+
+With --baseline the exit status is 1 when a benchmark's p50 is slower than the
+baseline by more than the tolerance.
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+
+import fixture_server
+from pdf_fixtures import synthetic_resume
+
+import job_role_prediction
+import linkdin_jobs
+import resume_extract
+
+FIXTURES = fixture_server.FIXTURES
+PDF_SIZES = (1, 5, 20)
+# Long document for the pdfium page fan-out, split over PDF_FANOUT_WORKERS processes
+LARGE_PDF_PAGES = 100
+PDF_FANOUT_WORKERS = min(4, os.cpu_count() or 1)
+BATCH_SIZE = 100
+
+
+def percentile(values, q):
+    values = sorted(values)
+    index = (len(values) - 1) * q
+    lower = int(index)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (index - lower)
+
+
+# Function to time func repeat times (after warmup untimed calls); setup runs untimed before each call.
+# items is how many units of work (pages, profiles, postings) one call handles
+def measure(func, repeat, items=1, unit="calls", warmup=1, setup=None):
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    total = sum(timings)
+    return {
+        "calls": repeat,
+        "p50_ms": percentile(timings, 0.5) * 1000,
+        "p95_ms": percentile(timings, 0.95) * 1000,
+        "mean_ms": total / repeat * 1000,
+        "throughput": repeat * items / total if total else float("inf"),
+        "unit": f"{unit}/s",
+    }
+
+
+def read_fixtures(kind):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, kind, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            pages.append(f.read())
+    return pages
+
+
+# Function to cycle through a list on every call, so each timed call works on the next fixture
+def cycling(values):
+    state = {"i": 0}
+
+    def next_value():
+        value = values[state["i"] % len(values)]
+        state["i"] += 1
+        return value
+
+    return next_value
+
+
+def resume_cases(repeat):
+    cases = []
+    backends = ["pdfplumber"] + (["pdfium"] if resume_extract.pypdfium2 is not None else [])
+    for backend in backends:
+        for pages in PDF_SIZES:
+            data = synthetic_resume(pages, seed=pages)
+            cases.append((f"pdf_text[{backend},{pages}p]",
+                          lambda data=data, backend=backend: resume_extract.extract_text_from_pdf(data, backend=backend),
+                          max(3, repeat // pages), pages, "pages"))
+    if "pdfium" in backends:
+        data = synthetic_resume(LARGE_PDF_PAGES, seed=LARGE_PDF_PAGES)
+        cases.append((f"pdf_text[pdfium,{LARGE_PDF_PAGES}p,{PDF_FANOUT_WORKERS} workers]",
+                      lambda: resume_extract.extract_text_from_pdf(data, max_pages=None, max_bytes=None, backend="pdfium",
+                                                                   workers=PDF_FANOUT_WORKERS),
+                      max(3, repeat // 5), LARGE_PDF_PAGES, "pages"))
+
+    text = resume_extract.extract_text_from_pdf(synthetic_resume(PDF_SIZES[1], seed=1))
+    cases.append(("resume_info", lambda: resume_extract.extract_resume_info(text), repeat * 5, 1, "resumes"))
+
+    profiles = []
+    for seed in range(BATCH_SIZE):
+        info = resume_extract.extract_resume_info(resume_extract.extract_text_from_pdf(synthetic_resume(1, seed)))
+        profiles.append((info["Skills"], info["Experience"], info["Qualification"]))
+    next_profile = cycling(profiles)
+    cases.append(("predict_single", lambda: job_role_prediction.predict_job_role(*next_profile()),
+                  repeat * 5, 1, "profiles"))
+    cases.append(("predict_top_roles", lambda: job_role_prediction.predict_top_job_roles(*next_profile()),
+                  repeat * 5, 1, "profiles"))
+    cases.append((f"predict_batch[{BATCH_SIZE}]", lambda: job_role_prediction.predict_job_roles(profiles),
+                  repeat, BATCH_SIZE, "profiles"))
+    return cases
+
+
+def posting_cases(repeat):
+    from bs4 import BeautifulSoup
+
+    postings = read_fixtures("postings")
+    soups = [BeautifulSoup(html, "html.parser") for html in postings]
+    job_data = [linkdin_jobs.extract_job_details(soup) for soup in soups]
+    next_html, next_soup, next_job_data = cycling(postings), cycling(soups), cycling(job_data)
+    search_pages = read_fixtures("search")
+    next_search = cycling(search_pages)
+    return [
+        ("posting_parse", lambda: linkdin_jobs.parse_posting_html(next_html()), repeat * 2, 1, "postings"),
+        ("extract_job_details", lambda: linkdin_jobs.extract_job_details(next_soup()), repeat * 5, 1, "postings"),
+        ("extract_skills", lambda: linkdin_jobs.extract_skills(next_job_data(), linkdin_jobs.known_tech_skills),
+         repeat * 5, 1, "postings"),
+        ("extract_skills_and_qualifications",
+         lambda: linkdin_jobs.extract_skills_and_qualifications(next_job_data()), repeat * 5, 1, "postings"),
+        ("search_parse", lambda: linkdin_jobs.parse_search_html(next_search()), repeat * 2, 1, "pages"),
+    ]
+
+
+# End-to-end /process through the Flask test client, scraping the local fixture server.
+# "cold" clears the resume, search and posting caches before every request, "warm" keeps them
+def process_cases(repeat):
+    import app as app_module
+    import http_session
+    import job_store
+    import resume_pipeline
+
+    _, base_url = fixture_server.serve()
+    linkdin_jobs.LINKEDIN_BASE_URL = base_url
+    http_session.configure(rate=0)
+    job_store.JOB_STORE_PATH = None
+    job_store._store = None
+
+    client = app_module.app.test_client()
+    data = synthetic_resume(2, seed=42)
+
+    def post():
+        response = client.post("/process", data={"resume": (io.BytesIO(data), "resume.pdf"), "location": "India"},
+                               content_type="multipart/form-data")
+        if response.status_code != 200:
+            raise RuntimeError(f"/process returned {response.status_code}")
+
+    def clear_caches():
+        linkdin_jobs.search_cache.clear()
+        linkdin_jobs.posting_cache.clear()
+        resume_pipeline.resume_cache.clear()
+
+    return [
+        ("process_cold", post, max(3, repeat // 2), 1, "requests", clear_caches),
+        ("process_warm", post, repeat, 1, "requests", None),
+    ]
+
+
+def run(repeat, only=None):
+    groups = [resume_cases, posting_cases, process_cases]
+    results = {}
+    for group in groups:
+        for case in group(repeat):
+            name, func, count, items, unit = case[:5]
+            setup = case[5] if len(case) > 5 else None
+            if only and not any(pattern in name for pattern in only):
+                continue
+            results[name] = measure(func, count, items, unit, setup=setup)
+            print_result(name, results[name])
+    return results
+
+
+def print_result(name, result):
+    print(f"{name:36s} p50 {result['p50_ms']:9.3f} ms  p95 {result['p95_ms']:9.3f} ms  "
+          f"{result['throughput']:10.1f} {result['unit']}", flush=True)
+
+
+# Function to compare results with a baseline; returns the names slower than it by more than tolerance
+def compare(results, baseline, tolerance):
+    regressions = []
+    print(f"\nCompared with the baseline (tolerance {tolerance:.0%}):")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:36s} (not in baseline)")
+            continue
+        ratio = result["p50_ms"] / base["p50_ms"]
+        status = "REGRESSION" if ratio > 1 + tolerance else "ok"
+        print(f"{name:36s} p50 {base['p50_ms']:9.3f} -> {result['p50_ms']:9.3f} ms  {ratio:6.2f}x  {status}")
+        if status != "ok":
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="base number of timed calls per benchmark")
+    parser.add_argument("--only", nargs="+", help="run only benchmarks whose name contains one of these")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="compare with results saved by --save-baseline")
+    parser.add_argument("--save-baseline", metavar="PATH", help="save the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p50 slowdown against the baseline")
+    args = parser.parse_args()
+
+    print(f"Python {platform.python_version()} on {platform.platform()}, repeat={args.repeat}\n")
+    results = run(args.repeat, args.only)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
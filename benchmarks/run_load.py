@@ -0,0 +1,171 @@
+"""Load test for /process against a stubbed job source.
+
+Starts the fixture server (recorded LinkedIn pages) and the app under gunicorn
+pointed at it, then posts synthetic resumes from several threads for a fixed
+time and reports sustained requests per second and latency percentiles.
+
+    python benchmarks/run_load.py [--concurrency 8] [--duration 30] [--workers 1] [--threads 8]
+    python benchmarks/run_load.py --url http://127.0.0.1:8000   # an app that is already running
+
+Without gunicorn installed the app runs in Werkzeug's threaded server in this
+process instead. Every request sends a different resume unless --repeat-pdfs
+is given, so the resume cache does not answer them.
+"""
+import argparse
+import itertools
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PACKAGE_ROOT = os.path.dirname(ROOT)
+sys.path.insert(0, PACKAGE_ROOT)
+sys.path.insert(0, ROOT)
+
+import requests
+
+import fixture_server
+from pdf_fixtures import synthetic_resume
+from run_benchmarks import percentile
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(url, timeout=120, alive=lambda: True):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if not alive():
+            raise RuntimeError("the app exited before it came up")
+        try:
+            requests.get(url, timeout=2)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.25)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+# Function to start the app against the fixture server; returns (base_url, stop, alive)
+def start_app(job_source_url, workers, threads):
+    env = dict(os.environ, LINKEDIN_BASE_URL=job_source_url, SCRAPER_RATE_LIMIT="0", JOB_STORE_PATH="")
+    port = free_port()
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        gunicorn = None
+
+    if gunicorn is not None:
+        env.update(BIND=f"127.0.0.1:{port}", WEB_WORKERS=str(workers), WEB_THREADS=str(threads), WEB_ACCESS_LOG="")
+        process = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:application"],
+                                   cwd=PACKAGE_ROOT, env=env)
+
+        def stop():
+            process.terminate()
+            process.wait(30)
+
+        return f"http://127.0.0.1:{port}", stop, lambda: process.poll() is None
+
+    from werkzeug.serving import make_server
+
+    os.environ.update(env)
+    import wsgi
+    import linkdin_jobs
+    import job_store
+    linkdin_jobs.LINKEDIN_BASE_URL = job_source_url
+    job_store.JOB_STORE_PATH = None
+    server = make_server("127.0.0.1", port, wsgi.application, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{port}", server.shutdown, lambda: True
+
+
+# Function to post resumes from concurrency threads for duration seconds (after warmup seconds)
+def run_load(base_url, concurrency, duration, warmup=5, location="India", repeat_pdfs=None):
+    seeds = itertools.count()
+    lock = threading.Lock()
+    latencies, errors = [], {}
+    started = time.time()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    def next_pdf():
+        with lock:
+            seed = next(seeds)
+        return synthetic_resume(1 + seed % 3, seed % repeat_pdfs if repeat_pdfs else seed)
+
+    def worker():
+        session = requests.Session()
+        while True:
+            data = next_pdf()
+            start = time.time()
+            if start >= stop_at:
+                return
+            try:
+                response = session.post(f"{base_url}/process", data={"location": location},
+                                        files={"resume": ("resume.pdf", data, "application/pdf")}, timeout=120)
+                outcome = None if response.status_code == 200 else f"HTTP {response.status_code}"
+            except requests.RequestException as e:
+                outcome = e.__class__.__name__
+            end = time.time()
+            if start < measure_from or end > stop_at:
+                continue
+            with lock:
+                if outcome is None:
+                    latencies.append(end - start)
+                else:
+                    errors[outcome] = errors.get(outcome, 0) + 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    report = {"concurrency": concurrency, "seconds": duration, "requests": len(latencies),
+              "errors": errors, "rps": len(latencies) / duration}
+    if latencies:
+        report.update({f"p{int(q * 100)}_ms": percentile(latencies, q) * 1000 for q in (0.5, 0.95, 0.99)})
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="base URL of an app that is already running (its job source is up to you)")
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds of load before measuring")
+    parser.add_argument("--workers", type=int, default=1, help="gunicorn worker processes")
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker")
+    parser.add_argument("--repeat-pdfs", type=int, metavar="N", help="cycle through N resumes instead of new ones")
+    args = parser.parse_args()
+
+    stop, alive = None, lambda: True
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        _, job_source_url = fixture_server.serve()
+        base_url, stop, alive = start_app(job_source_url, args.workers, args.threads)
+        print(f"Job source stub at {job_source_url}, app at {base_url}", flush=True)
+
+    try:
+        wait_until_up(base_url, alive=alive)
+        report = run_load(base_url, args.concurrency, args.duration, args.warmup, repeat_pdfs=args.repeat_pdfs)
+    finally:
+        if stop is not None:
+            stop()
+
+    print(f"{report['requests']} requests in {report['seconds']:.0f}s with {report['concurrency']} clients: "
+          f"{report['rps']:.1f} requests/s")
+    if report["requests"]:
+        print(f"latency p50 {report['p50_ms']:.1f} ms  p95 {report['p95_ms']:.1f} ms  p99 {report['p99_ms']:.1f} ms")
+    if report["errors"]:
+        print("errors:", report["errors"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+# In-process cache with a time to live per entry and least recently used eviction
+class TTLCache:
+    def __init__(self, maxsize=1024, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self.lock:
+            item = self.data.get(key)
+            if item is not None:
+                expires, value = item
+                if expires is None or expires > time.monotonic():
+                    self.data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self.lock:
+            self.data[key] = (expires, value)
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.data.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+    def __len__(self):
+        return len(self.data)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self.data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+# On-disk cache backed by SQLite, with the same interface and eviction rules as TTLCache
+class SQLiteCache:
+    def __init__(self, path, maxsize=10000, ttl=3600, table="cache"):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.table = table
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = None
+        self.conn_pid = None
+        with self.lock:
+            self._connection()
+
+    # A connection must not be used across a fork (the app is imported before gunicorn forks its
+    # workers), so every process opens its own
+    def _connection(self):
+        if self.conn is None or self.conn_pid != os.getpid():
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn_pid = os.getpid()
+            with self.conn:
+                self.conn.execute("PRAGMA journal_mode=WAL")
+                self.conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.table} "
+                    "(key TEXT PRIMARY KEY, value BLOB, expires REAL, accessed REAL)"
+                )
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed)")
+        return self.conn
+
+    def get(self, key, default=None):
+        key = repr(key)
+        now = time.time()
+        with self.lock, self._connection() as conn:
+            row = conn.execute(f"SELECT value, expires FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                value, expires = row
+                if expires is None or expires > now:
+                    conn.execute(f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (now, key))
+                    self.hits += 1
+                    return pickle.loads(value)
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        now = time.time()
+        expires = now + self.ttl if self.ttl else None
+        with self.lock, self._connection() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires, accessed) VALUES (?, ?, ?, ?)",
+                (repr(key), pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires, now),
+            )
+            # Evict expired rows first, then the least recently used ones above maxsize
+            conn.execute(f"DELETE FROM {self.table} WHERE expires IS NOT NULL AND expires <= ?", (now,))
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} "
+                "ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+    def delete(self, key):
+        with self.lock, self._connection() as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (repr(key),))
+
+    def clear(self):
+        with self.lock, self._connection() as conn:
+            conn.execute(f"DELETE FROM {self.table}")
+
+    def __len__(self):
+        with self.lock:
+            return self._connection().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+# Function to build a cache, on disk when a path is given and in memory otherwise
+def make_cache(path=None, maxsize=1024, ttl=3600, table="cache"):
+    if path:
+        return SQLiteCache(path, maxsize=maxsize, ttl=ttl, table=table)
+    return TTLCache(maxsize=maxsize, ttl=ttl)
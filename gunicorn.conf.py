@@ -0,0 +1,62 @@
+# Gunicorn settings for serving wsgi:application, each overridable from the environment:
+#   gunicorn -c gunicorn.conf.py wsgi:application
+import os
+
+bind = os.environ.get("BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+
+# One worker process by default, scaled with WEB_THREADS request threads: requests mostly wait on
+# LinkedIn, so threads are cheaper than more processes. Worker processes share the preloaded
+# models, and the outbound rate limit is split between them. What else a worker keeps to
+# itself is only shared when configured, so before raising WEB_WORKERS set:
+#   JOB_STORE_PATH (or TASK_STORE_PATH)    background task state for /status and /result, and the job store
+#   METRICS_MULTIPROC_DIR                  /metrics adding up every worker
+#   SCRAPER_CACHE_PATH, RESUME_CACHE_PATH  one search, posting and resume cache instead of one per worker
+workers = int(os.environ.get("WEB_WORKERS", 1))
+threads = int(os.environ.get("WEB_THREADS", 8))
+worker_class = "gthread"
+
+# Import the app (and load the models) once in the master, before forking the workers
+preload_app = True
+
+# A cold /process scrapes several search pages and postings
+timeout = int(os.environ.get("WEB_TIMEOUT", 120))
+graceful_timeout = int(os.environ.get("WEB_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("WEB_KEEPALIVE", 5))
+
+# Recycle workers now and then to bound memory growth from caches
+max_requests = int(os.environ.get("WEB_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.environ.get("WEB_MAX_REQUESTS_JITTER", 200))
+
+# An empty WEB_ACCESS_LOG turns the access log off
+accesslog = os.environ.get("WEB_ACCESS_LOG", "-") or None
+loglevel = os.environ.get("WEB_LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    # Metrics files left by an earlier run (METRICS_MULTIPROC_DIR) would be added to this one's
+    import metrics
+    metrics.clear_snapshots()
+
+
+def post_fork(server, worker):
+    # Connections must not be shared across the fork: give each worker its own HTTP session
+    import http_session
+    http_session.configure(pool_size=http_session.POOL_SIZE)
+    # Every worker has its own token bucket, so each gets an equal share of SCRAPER_RATE_LIMIT
+    http_session.share_rate_limit(server.cfg.workers)
+
+    # Metrics recorded in the master (the warm-up) would be counted once per worker; each worker
+    # starts empty and, with METRICS_MULTIPROC_DIR, writes its metrics for /metrics to add up
+    import metrics
+    metrics.reset()
+    metrics.start_writer()
+
+    # Background threads (the job store refresher) are started per worker, after the fork
+    import wsgi
+    wsgi.start_background()
+
+
+def worker_exit(server, worker):
+    # Keep the counts of a worker that is recycled or shut down
+    import metrics
+    metrics.write_snapshot()
@@ -0,0 +1,137 @@
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+# Connection pool and retry settings (can be overridden with environment variables)
+POOL_SIZE = int(os.environ.get("SCRAPER_POOL_SIZE", 16))
+MAX_RETRIES = int(os.environ.get("SCRAPER_MAX_RETRIES", 3))
+BACKOFF_BASE = float(os.environ.get("SCRAPER_BACKOFF_BASE", 0.5))
+BACKOFF_MAX = float(os.environ.get("SCRAPER_BACKOFF_MAX", 30))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Outbound rate limit shared by every worker thread of the process (requests per second and burst size)
+RATE_LIMIT = float(os.environ.get("SCRAPER_RATE_LIMIT", 5))
+RATE_BURST = int(os.environ.get("SCRAPER_RATE_BURST", 10))
+
+
+# Thread safe token bucket used to cap the outbound request rate
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # Take tokens from the bucket, waiting until they are available (or until timeout)
+    def acquire(self, tokens=1, timeout=None):
+        if self.rate <= 0:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return True
+                wait = (tokens - self.tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+rate_limiter = TokenBucket(RATE_LIMIT, RATE_BURST)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+# Function to build a session with a keep-alive connection pool (retries are handled in get())
+def create_session(pool_size=POOL_SIZE):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Function to get the process wide session, created on first use
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+# Function to change the rate limit or pool size at runtime (e.g. from tests or a stub server run)
+def configure(rate=None, burst=None, pool_size=None):
+    global rate_limiter, _session
+    if rate is not None or burst is not None:
+        rate_limiter = TokenBucket(RATE_LIMIT if rate is None else rate,
+                                   RATE_BURST if burst is None else burst)
+    if pool_size is not None:
+        with _session_lock:
+            old_session, _session = _session, create_session(pool_size)
+        if old_session is not None:
+            old_session.close()
+
+
+# Function to split the rate limit evenly between processes that each have their own bucket
+# (e.g. gunicorn workers), so that together they stay within SCRAPER_RATE_LIMIT
+def share_rate_limit(processes):
+    processes = max(1, int(processes))
+    configure(rate=RATE_LIMIT / processes, burst=max(1, RATE_BURST // processes))
+
+
+# Exponential backoff with full jitter, honouring a Retry-After header when the server sends one
+def backoff_delay(attempt, response=None):
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+# Function to send a rate limited GET request, retrying throttled and failed responses
+def get(url, timeout=10, max_retries=MAX_RETRIES, **kwargs):
+    session = get_session()
+    for attempt in range(max_retries + 1):
+        rate_limiter.acquire()
+        started = time.perf_counter()
+        try:
+            response = session.get(url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            metrics.observe("http_request_seconds", time.perf_counter() - started, status=e.__class__.__name__)
+            metrics.inc("http_requests_total", status=e.__class__.__name__)
+            if attempt == max_retries:
+                raise
+            metrics.inc("http_retries_total")
+            time.sleep(backoff_delay(attempt))
+            continue
+        metrics.observe("http_request_seconds", time.perf_counter() - started, status=response.status_code)
+        metrics.inc("http_requests_total", status=response.status_code)
+
+        if response.status_code in RETRY_STATUSES and attempt < max_retries:
+            metrics.inc("http_retries_total")
+            time.sleep(backoff_delay(attempt, response))
+            continue
+
+        # Raise for throttled or failed responses instead of handing back an empty page
+        response.raise_for_status()
+        return response
@@ -1,20 +1,88 @@
 import warnings
 warnings.filterwarnings("ignore")
 
-import joblib
+import numpy as np
 import pandas as pd
 import re
-
-# Load saved models and encoders
-model = joblib.load('models\model.pkl')
-mlb = joblib.load('models\mlb_skills.pkl')
-degree_encoder = joblib.load('models\degree_encoder.pkl')
-domain_encoder = joblib.load('models\domain_encoder.pkl')
-job_encoder = joblib.load('models\job_encoder.pkl')
+from functools import lru_cache
+
+import model_registry
+
+# Saved models and encoders are loaded lazily, once per process, by model_registry
+def __getattr__(name):
+    # Keeps job_role_prediction.model, .mlb, ... and .FEATURE_COLUMNS working
+    if name in model_registry.ARTIFACTS:
+        return model_registry.get(name)
+    if name == 'FEATURE_COLUMNS':
+        return feature_layout()['columns']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Features after the one-hot skill columns, in training order
+NUMERIC_FEATURES = ['Experience', 'Degree_encoded', 'Domain_encoded']
+# Every label extract_degree and extract_domain can return
+DEGREE_LABELS = ['BSc', 'BTech', 'MSc', 'MTech', 'Other', 'PhD']
+DOMAIN_LABELS = ['Cloud', 'Computer Science', 'Cybersecurity', 'Data Science', 'General', 'Machine Learning']
+
+
+# Function to check loaded artifacts against the metadata train_model.py saved with them
+def check_compatibility(metadata, model, mlb, degree_encoder, domain_encoder, job_encoder):
+    def fail(message):
+        raise model_registry.IncompatibleModelError(
+            f"Model artifacts in {model_registry.MODELS_DIR} (version {metadata.get('version')}): {message}")
+
+    if metadata.get('format_version') != model_registry.FORMAT_VERSION:
+        fail(f"metadata format {metadata.get('format_version')} is not supported "
+             f"(expected {model_registry.FORMAT_VERSION}), retrain with train_model.py")
+    columns = metadata['feature_columns']
+    if columns != list(mlb.classes_) + NUMERIC_FEATURES:
+        fail("feature columns do not match the skills binarizer")
+    if getattr(model, 'n_features_in_', len(columns)) != len(columns):
+        fail(f"the model expects {model.n_features_in_} features, the metadata lists {len(columns)}")
+    if list(job_encoder.classes_) != metadata['job_roles'] or len(model.classes_) != len(metadata['job_roles']):
+        fail("job roles do not match the model and job encoder")
+    if list(degree_encoder.classes_) != metadata['degrees'] or list(domain_encoder.classes_) != metadata['domains']:
+        fail("degree or domain labels do not match their encoders")
+
+
+# Function to map labels to encoder codes; labels the encoder was fitted without (the original
+# degree encoder has no MTech) get the code of the fallback label instead of failing
+def label_codes(encoder, labels, fallback):
+    codes = {label: code for code, label in enumerate(encoder.classes_)}
+    for label in labels:
+        codes.setdefault(label, codes[fallback])
+    return codes
+
+
+# ---- Precomputed feature layout for the fast prediction path ----
+@lru_cache(maxsize=1)
+def feature_layout():
+    model = model_registry.get('model')
+    mlb = model_registry.get('mlb')
+    degree_encoder = model_registry.get('degree_encoder')
+    domain_encoder = model_registry.get('domain_encoder')
+    metadata = model_registry.get_metadata()
+    if metadata is not None:
+        check_compatibility(metadata, model, mlb, degree_encoder, domain_encoder, model_registry.get('job_encoder'))
+        columns = list(metadata['feature_columns'])
+    else:
+        # Column order the model was trained with: one column per skill, then the three numeric features
+        columns = list(getattr(model, 'feature_names_in_', list(mlb.classes_) + NUMERIC_FEATURES))
+    feature_index = {name: i for i, name in enumerate(columns)}
+    return {
+        'columns': columns,
+        'skill_index': {skill: feature_index[skill] for skill in mlb.classes_},
+        'experience': feature_index['Experience'],
+        'degree': feature_index['Degree_encoded'],
+        'domain': feature_index['Domain_encoded'],
+        'degree_codes': label_codes(degree_encoder, DEGREE_LABELS, 'Other'),
+        'domain_codes': label_codes(domain_encoder, DOMAIN_LABELS, 'General'),
+    }
 
 # ---- Preprocess Skills ----
 def preprocess_skills(skills_input):
     skills_input_cleaned = [s.strip().lower() for s in skills_input]
+    mlb = model_registry.get('mlb')
     skills_vector = mlb.transform([skills_input_cleaned])
     skills_df_input = pd.DataFrame(skills_vector, columns=mlb.classes_)
     return skills_df_input
@@ -78,30 +146,80 @@ def extract_domain(qual):
     else: return 'General'
 
 
-def predict_job_role(skills_input, experience_input, qualification_input):
-    # ---- Preprocess Inputs ----
-    skills_df_input = preprocess_skills(skills_input)
+# ---- Build the feature matrix for a batch of profiles ----
+def build_feature_matrix(profiles):
+    layout = feature_layout()
+    skill_index = layout['skill_index']
+    features = np.zeros((len(profiles), len(layout['columns'])), dtype=np.float64)
+    for row, (skills_input, experience_input, qualification_input) in enumerate(profiles):
+        for skill in skills_input:
+            column = skill_index.get(skill.strip().lower())
+            if column is not None:
+                features[row, column] = 1
+        features[row, layout['experience']] = convert_experience(experience_input)
+        features[row, layout['degree']] = layout['degree_codes'][extract_degree(qualification_input)]
+        features[row, layout['domain']] = layout['domain_codes'][extract_domain(qualification_input)]
+    return features
 
-    experience_value = convert_experience(experience_input)
 
-    degree = extract_degree(qualification_input)
-    domain = extract_domain(qualification_input)
+# A profile is either a (skills, experience, qualification) tuple or a dict from resume_extract.extract_resume_info
+def profile_fields(profile):
+    if isinstance(profile, dict):
+        return profile.get('Skills', []), profile.get('Experience'), profile.get('Qualification', [])
+    return profile
 
-    degree_encoded = degree_encoder.transform([degree])[0]
-    domain_encoded = domain_encoder.transform([domain])[0]
 
-    # ---- Combine All Features ----
-    input_df = skills_df_input.copy()
-    input_df['Experience'] = experience_value
-    input_df['Degree_encoded'] = degree_encoded
-    input_df['Domain_encoded'] = domain_encoded
+def predict_job_roles(profiles):
+    profiles = [profile_fields(profile) for profile in profiles]
+    if not profiles:
+        return []
 
-    # ---- Predict ----
-    predicted_label = model.predict(input_df)[0]
-    predicted_job_role = job_encoder.inverse_transform([predicted_label])[0]
+    # ---- Predict all profiles in one call ----
+    predicted_labels = model_registry.get('model').predict(build_feature_matrix(profiles))
+    return model_registry.get('job_encoder').inverse_transform(predicted_labels).tolist()
 
-    # print("✅ Predicted IT Job Role:", predicted_job_role)
-    return predicted_job_role
+
+def predict_job_role(skills_input, experience_input, qualification_input):
+    return predict_job_roles([(skills_input, experience_input, qualification_input)])[0]
+
+
+# ---- Class probabilities for a feature matrix ----
+def predict_probabilities(features):
+    model = model_registry.get('model')
+    if hasattr(model, 'predict_proba') and getattr(model, 'probability', True):
+        return model.predict_proba(features)
+    # The SVC is trained without probability estimates, so use a softmax over its one-vs-rest scores
+    scores = model.decision_function(features)
+    scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+    return scores / scores.sum(axis=1, keepdims=True)
+
+
+def predict_top_job_roles_batch(profiles, k=3):
+    profiles = [profile_fields(profile) for profile in profiles]
+    if not profiles:
+        return []
+
+    features = build_feature_matrix(profiles)
+    probabilities = predict_probabilities(features)
+    model = model_registry.get('model')
+    # The first role is the model's own prediction, as predict_job_role gives it; the softmax over
+    # the one-vs-rest scores can disagree with the SVC's vote, so it only orders the other roles
+    predicted = np.searchsorted(model.classes_, model.predict(features))
+    order = -probabilities
+    order[np.arange(len(profiles)), predicted] = -np.inf
+    k = min(k, probabilities.shape[1])
+    top_labels = np.argsort(order, axis=1, kind='stable')[:, :k]
+    job_encoder = model_registry.get('job_encoder')
+    roles = job_encoder.inverse_transform(model.classes_[top_labels].ravel()).reshape(top_labels.shape)
+    return [
+        [(str(role), float(probability)) for role, probability in zip(roles[row], probabilities[row, top_labels[row]])]
+        for row in range(len(profiles))
+    ]
+
+
+# Returns k roles as (role, probability) pairs: the predicted role, then the likeliest others
+def predict_top_job_roles(skills_input, experience_input, qualification_input, k=3):
+    return predict_top_job_roles_batch([(skills_input, experience_input, qualification_input)], k)[0]
 
 
 if __name__ == "__main__":
@@ -109,4 +227,6 @@ if __name__ == "__main__":
     experience_input = '2 Year'
     qualification_input = 'B-tech'
     predicted_job_role = predict_job_role(skills_input, experience_input, qualification_input)
-    print("Predicted Job Role:", predicted_job_role)
\ No newline at end of file
+    print("Predicted Job Role:", predicted_job_role)
+    for role, probability in predict_top_job_roles(skills_input, experience_input, qualification_input):
+        print(f"  {role}: {probability:.2%}")
\ No newline at end of file
@@ -0,0 +1,307 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+import scoring
+
+# Fields of a parsed posting kept in the store, with their SQLite column names
+POSTING_FIELDS = {
+    "Job ID": "job_id",
+    "Job Title": "title",
+    "Company Name": "company",
+    "Location": "location",
+    "Time Posted": "time_posted",
+    "No of Applicants": "applicants",
+    "Apply Link": "apply_link",
+    "Skills": "skills",
+    "Qualifications": "qualifications",
+}
+
+# A (role, location) search counts as fresh for this many seconds
+FRESH_SECONDS = int(os.environ.get("JOB_STORE_FRESH_SECONDS", 6 * 60 * 60))
+# Fewer fresh postings than this for a search and it counts as sparse
+MIN_POSTINGS = int(os.environ.get("JOB_STORE_MIN_POSTINGS", 8))
+
+
+def normalize(value):
+    return " ".join(str(value or "").lower().split())
+
+
+# Persistent store of parsed job postings with an inverted index from each skill and qualification
+# to the job ids mentioning it. Postings live in SQLite; the index is kept in memory as well so
+# lookups are set operations. Rows written by other processes (a separate refresher, other server
+# workers) are merged into the index before every lookup, see sync()
+class JobStore:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS postings (job_id TEXT PRIMARY KEY, title TEXT, company TEXT, "
+                "location TEXT, time_posted TEXT, applicants TEXT, apply_link TEXT, skills TEXT, "
+                "qualifications TEXT, fetched_at REAL, seq INTEGER NOT NULL DEFAULT 0)"
+            )
+            # The inverted index is built from the postings' own skill lists; stores written by earlier
+            # versions also kept it as a table, which nothing reads
+            self.conn.execute("DROP TABLE IF EXISTS posting_terms")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_results (role TEXT, location TEXT, job_id TEXT, "
+                "fetched_at REAL, seq INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (role, location, job_id)) WITHOUT ROWID"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS search_results_job ON search_results (job_id)")
+            # Every write stamps its rows with the next number of this one-row sequence, so other
+            # processes can merge exactly the rows written since they last looked, see _merge()
+            self.conn.execute("CREATE TABLE IF NOT EXISTS write_sequence (seq INTEGER NOT NULL)")
+            if self.conn.execute("SELECT COUNT(*) FROM write_sequence").fetchone()[0] == 0:
+                self.conn.execute("INSERT INTO write_sequence (seq) VALUES (0)")
+            for table in ("postings", "search_results"):
+                columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+                if "seq" not in columns:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+                self.conn.execute(f"DROP INDEX IF EXISTS {table}_fetched")
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_seq ON {table} (seq)")
+        self._load()
+
+    # Build the in-memory postings and index from the database
+    def _load(self):
+        with self.lock:
+            self.postings = {}
+            self.skill_index = {}
+            self.qualification_index = {}
+            self.searches = {}
+            self.data_version = self._data_version()
+            self.postings_seq = self.searches_seq = -1
+            self._merge()
+
+    # SQLite bumps this whenever another connection commits to the database (our own commits don't)
+    def _data_version(self):
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    # Function to take the next write sequence number; called inside the write's transaction, which
+    # holds SQLite's write lock until it commits, so the numbers are committed in order
+    def _next_seq(self):
+        self.conn.execute("UPDATE write_sequence SET seq = seq + 1")
+        return self.conn.execute("SELECT seq FROM write_sequence").fetchone()[0]
+
+    # Function to index the rows written after the last ones seen. Each table has its own cursor, as
+    # a write may commit between the two queries. Our own rows are read again, which is harmless
+    # since indexing a posting replaces its old entry
+    def _merge(self):
+        for row in self.conn.execute(f"SELECT {', '.join(POSTING_FIELDS.values())}, seq, fetched_at FROM postings "
+                                     "WHERE seq > ?", (self.postings_seq,)):
+            self._index(self._row_to_posting(row))
+            self.postings_seq = max(self.postings_seq, row[-2])
+        for role, location, job_id, fetched_at, seq in self.conn.execute(
+                "SELECT role, location, job_id, fetched_at, seq FROM search_results WHERE seq > ?",
+                (self.searches_seq,)):
+            self.searches.setdefault((role, location), {})[job_id] = fetched_at
+            self.searches_seq = max(self.searches_seq, seq)
+
+    # Function to pick up what other processes wrote since the last call. New and refreshed rows are
+    # merged; when rows were deleted elsewhere (another process expired them) everything is reloaded
+    def sync(self):
+        with self.lock:
+            data_version = self._data_version()
+            if data_version == self.data_version:
+                return
+            self.data_version = data_version
+            self._merge()
+            if self.conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0] != len(self.postings):
+                self._load()
+
+    def _row_to_posting(self, row):
+        posting = dict(zip(POSTING_FIELDS, row))
+        posting["Skills"] = json.loads(posting["Skills"] or "[]")
+        posting["Qualifications"] = json.loads(posting["Qualifications"] or "[]")
+        posting["Fetched At"] = row[-1]
+        return posting
+
+    def _index(self, posting):
+        job_id = posting["Job ID"]
+        self._unindex(job_id)
+        self.postings[job_id] = posting
+        for skill in posting["Skills"]:
+            self.skill_index.setdefault(skill, set()).add(job_id)
+        for qualification in posting["Qualifications"]:
+            self.qualification_index.setdefault(qualification, set()).add(job_id)
+
+    def _unindex(self, job_id):
+        old = self.postings.pop(job_id, None)
+        if old is None:
+            return
+        for term, index in [(skill, self.skill_index) for skill in old["Skills"]] + \
+                           [(qualification, self.qualification_index) for qualification in old["Qualifications"]]:
+            job_ids = index.get(term)
+            if job_ids is not None:
+                job_ids.discard(job_id)
+                if not job_ids:
+                    del index[term]
+
+    # Function to add or refresh parsed postings; role and location record which search found them
+    def add_postings(self, postings, role=None, location=None, fetched_at=None):
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        postings = [posting for posting in postings if posting.get("Job ID")]
+        if not postings:
+            return
+        with self.lock, self.conn:
+            seq = self._next_seq()
+            for posting in postings:
+                posting = {field: posting.get(field) for field in POSTING_FIELDS}
+                posting["Skills"] = list(posting["Skills"] or [])
+                posting["Qualifications"] = list(posting["Qualifications"] or [])
+                posting["Fetched At"] = fetched_at
+                job_id = posting["Job ID"]
+
+                values = [json.dumps(posting[field]) if field in ("Skills", "Qualifications") else posting[field]
+                          for field in POSTING_FIELDS]
+                self.conn.execute(
+                    f"INSERT OR REPLACE INTO postings ({', '.join(POSTING_FIELDS.values())}, fetched_at, seq) "
+                    f"VALUES ({', '.join('?' * (len(POSTING_FIELDS) + 2))})",
+                    values + [fetched_at, seq],
+                )
+                self._index(posting)
+
+                if role is not None:
+                    key = (normalize(role), normalize(location))
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO search_results (role, location, job_id, fetched_at, seq) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        key + (job_id, fetched_at, seq),
+                    )
+                    self.searches.setdefault(key, {})[job_id] = fetched_at
+
+    # Function to record that a (role, location) search listed these job ids, without touching the postings
+    def record_search(self, role, location, job_ids, fetched_at=None):
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        key = (normalize(role), normalize(location))
+        job_ids = [job_id for job_id in job_ids if job_id in self.postings]
+        if not job_ids:
+            return
+        with self.lock, self.conn:
+            seq = self._next_seq()
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO search_results (role, location, job_id, fetched_at, seq) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [key + (job_id, fetched_at, seq) for job_id in job_ids],
+            )
+            found = self.searches.setdefault(key, {})
+            for job_id in job_ids:
+                found[job_id] = fetched_at
+
+    def has(self, job_id):
+        return job_id in self.postings
+
+    def get(self, job_id):
+        return self.postings.get(job_id)
+
+    def __len__(self):
+        self.sync()
+        return len(self.postings)
+
+    # Job ids found by a (role, location) search within the last max_age seconds
+    # (under the lock: the refresher and other requests change these dicts while we iterate them)
+    def search_job_ids(self, role, location, max_age=FRESH_SECONDS):
+        oldest = time.time() - max_age
+        with self.lock:
+            found = self.searches.get((normalize(role), normalize(location)), {})
+            return {job_id for job_id, fetched_at in found.items() if fetched_at >= oldest and job_id in self.postings}
+
+    # Function to tell whether the store can answer for these roles without scraping
+    def is_fresh(self, roles, location, max_age=FRESH_SECONDS, min_postings=MIN_POSTINGS):
+        self.sync()
+        job_ids = set()
+        with self.lock:
+            for role, _ in roles:
+                job_ids |= self.search_job_ids(role, location, max_age)
+        return len(job_ids) >= min_postings
+
+    # Function to rank stored postings against a profile. roles is a list of (role, probability)
+    # pairs limiting the candidates to postings found for those roles at this location; without
+    # roles every posting sharing a skill with the user is a candidate
+    def search(self, user_skills, user_qualifications, roles=None, location=None, n=4, max_age=FRESH_SECONDS,
+               weights=None):
+        self.sync()
+        with self.lock:
+            # Skill match of every posting sharing at least one skill, from the posting lists
+            overlap = Counter()
+            for skill in set(user_skills):
+                overlap.update(self.skill_index.get(skill, ()))
+
+            if roles:
+                job_roles = {}
+                for role, probability in sorted(roles, key=lambda role: role[1], reverse=True):
+                    for job_id in self.search_job_ids(role, location, max_age):
+                        job_roles.setdefault(job_id, (role, probability))
+                candidates = job_roles
+            else:
+                job_roles = {}
+                candidates = overlap
+
+            # Same rule as linkdin_jobs: a posting without listed qualifications matches any user
+            # with at least one qualification
+            user_qualifications = set(user_qualifications)
+            if not user_qualifications:
+                return []
+            # Candidates come from sets; sorting them gives ties in the ranking a fixed order
+            matches = []
+            for job_id in sorted(candidates):
+                posting = self.postings[job_id]
+                qualifications = posting["Qualifications"]
+                if qualifications and user_qualifications.isdisjoint(qualifications):
+                    continue
+                role, probability = job_roles.get(job_id, (None, 1.0))
+                skill_match = overlap.get(job_id, 0)
+                matches.append(dict(posting, **{
+                    "Skill Match": skill_match,
+                    "Qualification Match": 1,
+                    "Role": role,
+                    "Role Probability": probability,
+                }))
+
+            return [match for _, match in scoring.rank_postings(matches, user_skills, n=n, weights=weights)]
+
+    # Function to drop postings fetched more than max_age seconds ago; returns how many were removed
+    def expire(self, max_age):
+        oldest = time.time() - max_age
+        with self.lock, self.conn:
+            expired = [job_id for job_id, posting in self.postings.items() if posting["Fetched At"] < oldest]
+            for job_id in expired:
+                self.conn.execute("DELETE FROM postings WHERE job_id = ?", (job_id,))
+                self.conn.execute("DELETE FROM search_results WHERE job_id = ?", (job_id,))
+                self._unindex(job_id)
+                for found in self.searches.values():
+                    found.pop(job_id, None)
+            return len(expired)
+
+    def stats(self):
+        self.sync()
+        return {
+            "postings": len(self.postings),
+            "skills": len(self.skill_index),
+            "qualifications": len(self.qualification_index),
+            "searches": len(self.searches),
+        }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+# The store shared by the scraper and the app, enabled by setting JOB_STORE_PATH
+JOB_STORE_PATH = os.environ.get("JOB_STORE_PATH")
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None and JOB_STORE_PATH:
+        with _store_lock:
+            if _store is None:
+                _store = JobStore(JOB_STORE_PATH)
+    return _store
@@ -0,0 +1,105 @@
+import re
+from functools import lru_cache
+
+# Tech skills and qualifications looked for in resumes and job postings
+SKILL_KEYWORDS = [
+    "Python", "Golang", "Go", "AWS", "Java", "JavaScript", "React", "Node.js",
+    "SQL", "MongoDB", "PostgreSQL", "Docker", "Kubernetes", "Git", "HTML", "CSS",
+    "C++", "C#", "Linux", "Flask", "Django", "TensorFlow", "PyTorch", "Hadoop",
+    "Spark", "Machine Learning", "Deep Learning", "REST API", "CI/CD", "Agile",
+    "MySQL", "MongoDB", "GCP", "Azure", "Jenkins", "Ansible", "Terraform", "DevOps",
+    "Matplotlib", "Plotly", "Front-end", "Back-end", "QT", "QML", "GUI",
+    "Geographic Information System", "GIS", "FPGA", "OpenCV", "CUDA", "OpenCL", "Spacy",
+    "NLTK", "Pandas", "NumPy", "Scikit-learn", "Keras", "FastAPI", "GraphQL", "NLP"
+]
+
+QUALIFICATION_KEYWORDS = [
+    'BTech', 'MTech', 'MCA', 'BCA', 'B.Sc', 'M.Sc', 'Bachelor', 'Master', 'Graduate',
+    'Post Graduate', 'PHD', 'Computer Science', 'Engineering', 'Computer Application'
+]
+
+
+# Function to turn a list of lowercase keywords into a trie shaped regex, so that at every
+# position of the text only the branches sharing the next character are tried
+def _trie_pattern(keywords):
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            # The longer keyword is tried first and the shorter one on backtracking
+            body = "(?:" + body + ")?" if len(branches) > 1 or len(body) > 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+# Precompiled case-insensitive matcher that finds every keyword of a vocabulary in one pass.
+# A keyword matches when it has no word character right before or after it, i.e. (?<!\w)...(?!\w).
+# That is \b...\b for keywords that start and end with a word character, but unlike \b it also lets
+# keywords ending in a symbol ("C++", "C#") match before a space or the end of the text
+class KeywordMatcher:
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keywords))
+
+        # Map the lowercase form back to the keyword as it is written in the list
+        self.canonical = {}
+        for keyword in self.keywords:
+            self.canonical.setdefault(keyword.lower(), keyword)
+        lowered = list(self.canonical)
+
+        # A zero-width lookahead lets matches overlap, e.g. both "Post Graduate" and "Graduate"
+        self.pattern = re.compile(
+            r"(?=(?<!\w)(" + _trie_pattern(lowered) + r")(?!\w))",
+            re.IGNORECASE,
+        )
+
+        # Shorter keywords that also match whenever a longer keyword starting with them matches,
+        # e.g. "c" inside "c++", since the regex only reports the longest match at a position
+        known = set(lowered)
+        self.implied = {}
+        for keyword in lowered:
+            self.implied[keyword] = [
+                keyword[:i] for i in range(1, len(keyword))
+                if keyword[:i] in known and not (keyword[i].isalnum() or keyword[i] == "_")
+            ]
+
+    # Function to find the keywords present in a text
+    def find(self, text):
+        found = set()
+        for match in self.pattern.finditer(text):
+            keyword = match.group(1).lower()
+            found.add(self.canonical[keyword])
+            for other in self.implied[keyword]:
+                found.add(self.canonical[other])
+        return found
+
+    # Function to find the keywords present in any of several texts
+    def find_all(self, texts):
+        found = set()
+        for text in texts:
+            found |= self.find(text)
+        return found
+
+
+# Function to get a matcher for a keyword list, built once and reused afterwards
+@lru_cache(maxsize=32)
+def _cached_matcher(keywords):
+    return KeywordMatcher(keywords)
+
+
+def get_matcher(keywords):
+    return _cached_matcher(tuple(keywords))
+
+
+SKILL_MATCHER = get_matcher(SKILL_KEYWORDS)
+QUALIFICATION_MATCHER = get_matcher(QUALIFICATION_KEYWORDS)
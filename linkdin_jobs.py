@@ -1,67 +1,65 @@
 #Import dependencies
-import requests
-from bs4 import BeautifulSoup
+import os
+from bs4 import BeautifulSoup, SoupStrainer
 import random
 import pandas as pd
-import spacy
-
-known_tech_skills = [
-    "Python", "Golang", "Go", "AWS", "Java", "JavaScript", "React", "Node.js",
-    "SQL", "MongoDB", "PostgreSQL", "Docker", "Kubernetes", "Git", "HTML", "CSS",
-    "C++", "C#", "Linux", "Flask", "Django", "TensorFlow", "PyTorch", "Hadoop",
-    "Spark", "Machine Learning", "Deep Learning", "REST API", "CI/CD", "Agile",
-    "MySQL", "MongoDB", "GCP", "Azure", "Jenkins", "Ansible", "Terraform", "DevOps",
-    "Matplotlib", "Plotly", "Front-end", "Back-end", "QT", "QML", "GUI", 
-    "Geographic Information System", "GIS", "FPGA", "OpenCV", "CUDA", "OpenCL", "Spacy",
-    "NLTK", "Pandas", "NumPy", "Scikit-learn", "Keras", "FastAPI", "GraphQL", "NLP"
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed, wait
+import http_session
+from cache import make_cache
+import job_store
+import metrics
+import scoring
+from keyword_matcher import SKILL_KEYWORDS, QUALIFICATION_KEYWORDS, get_matcher
+
+# lxml is optional: with it pages are parsed by libxml2 directly, without it by BeautifulSoup
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+known_tech_skills = SKILL_KEYWORDS
+
+known_tech_qualifications = QUALIFICATION_KEYWORDS
+
+# Columns of the job postings DataFrame returned by linkdin()
+JOB_COLUMNS = [
+    "Job ID", "Job Title", "Company Name", "Location", "Time Posted", "No of Applicants",
+    "Apply Link", "Skill Match", "Qualification Match", "Skills", "Qualifications"
 ]
 
-
-known_tech_qualifications = [
-    'BTech', 'MTech', 'MCA', 'BCA', 'B.Sc', 'M.Sc', 'Bachelor', 'Master', 'Graduate',
-    'Post Graduate', 'PHD', 'Computer Science', 'Engineering', 'Computer Application'
-]
-
-# Load English tokenizer, tagger, parser, NER, and word vectors
-nlp = spacy.load("en_core_web_sm")
+# Function to join the category texts of a job posting into one text, so it is scanned only once
+def job_text(job_data):
+    parts = []
+    for category, texts in job_data.items():
+        if isinstance(texts, str):
+            texts = [texts]
+        parts.extend(texts)
+    # Texts are separated by newlines so that no keyword can match across two of them
+    return "\n".join(parts)
 
 
 # Function to scrape job skills from a LinkedIn job page
 def extract_skills(job_data, known_skills):
-    found_skills = set()
-
-    # Go through all the category texts
-    for category, texts in job_data.items():
-        for text in texts:
-            doc = nlp(text)
-            for token in doc:
-                if token.text in known_skills:
-                    found_skills.add(token.text)
-            # Also check for multi-word skill phrases
-            for phrase in known_skills:
-                if phrase.lower() in text.lower():
-                    found_skills.add(phrase)
-
+    # Find every known skill, including multi-word phrases, in one pass over the posting
+    found_skills = get_matcher(known_skills).find(job_text(job_data))
     return list(sorted(found_skills))
 
 
 # Function to scrape job qualifications from a LinkedIn job page
 def extract_qualifications(job_data, known_qualifications):
-    found_qualifications = set()
+    # Find every known qualification, including multi-word phrases, in one pass over the posting
+    found_qualifications = get_matcher(known_qualifications).find(job_text(job_data))
+    return list(sorted(found_qualifications))
 
-    # Go through all the category texts
-    for category, texts in job_data.items():
-        for text in texts:
-            doc = nlp(text)
-            for token in doc:
-                if token.text in known_qualifications:
-                    found_qualifications.add(token.text)
-            # Also check for multi-word skill phrases
-            for phrase in known_qualifications:
-                if phrase.lower() in text.lower():
-                    found_qualifications.add(phrase)
 
-    return list(sorted(found_qualifications))
+# Function to extract both skills and qualifications, joining the posting text only once
+def extract_skills_and_qualifications(job_data, known_skills=known_tech_skills,
+                                      known_qualifications=known_tech_qualifications):
+    text = job_text(job_data)
+    skills = sorted(get_matcher(known_skills).find(text))
+    qualifications = sorted(get_matcher(known_qualifications).find(text))
+    return skills, qualifications
 
 
 # Function to scrape job details from a LinkedIn job page
@@ -69,11 +67,17 @@ def extract_job_details(job_soup):
 
     soup = job_soup
 
-    job_details = {}
-
     # Locate the main job description container
     description_section = soup.find("div", class_="show-more-less-html__markup")
 
+    return extract_description_details(description_section)
+
+
+# Function to split the job description container into its categories (headings) and their texts
+def extract_description_details(description_section):
+
+    job_details = {}
+
     if description_section:
         current_category = "General Information"  # Default category
         job_details[current_category] = []
@@ -101,28 +105,317 @@ def extract_job_details(job_soup):
     return job_details
 
 
-def linkdin(title, location, user_skills, user_qualifications):
+# HTML parser for the LinkedIn pages: lxml when it is installed, the pure Python parser otherwise
+HTML_PARSER = os.environ.get("SCRAPER_HTML_PARSER") or ("lxml" if lxml_html is not None else "html.parser")
+
+# Fields of the posting top card and the class tokens that identify them
+TOP_CARD_FIELDS = {
+    "Job Title": {"top-card-layout__title"},
+    "Company Name": {"topcard__org-name-link"},
+    "Location": {"topcard__flavor", "topcard__flavor--bullet"},
+    "Time Posted": {"posted-time-ago__text"},
+    "No of Applicants": {"num-applicants__caption"},
+}
+TOP_CARD_CLASS = "top-card-layout"
+DESCRIPTION_CLASS = "show-more-less-html__markup"
+
+
+def _classes(element):
+    return set((element.get("class") or "").split())
+
+
+def _has_class(*names):
+    names = set(names)
+    # Called with the whole class attribute or a single token, depending on the BeautifulSoup version
+    return lambda value: value is not None and not names.isdisjoint(value.split())
+
+
+# Parse only the top card and description of a posting, and only the job cards of a search page
+POSTING_STRAINER = SoupStrainer(class_=_has_class(TOP_CARD_CLASS, DESCRIPTION_CLASS))
+SEARCH_CARD_STRAINER = SoupStrainer("div", class_=_has_class("base-card"))
+
+# Fetch settings for the job posting requests (the base URL can point at a local stub server)
+LINKEDIN_BASE_URL = os.environ.get("LINKEDIN_BASE_URL", "https://www.linkedin.com")
+MAX_WORKERS = 8
+REQUEST_TIMEOUT = 10
+# Seconds a batch of postings may take in total; postings still being fetched then are dropped,
+# so one slow posting (retried by http_session) can't hold up the recommendations
+FETCH_DEADLINE = 15
+
+# Pagination of the search listing: postings per page, pages fetched together, and the budget.
+# Paging stops once MIN_QUALIFIED postings pass the qualification filter or the budget is used up
+PAGE_SIZE = 10
+PAGE_CONCURRENCY = 2
+MAX_PAGES = 4
+MAX_POSTINGS = 40
+MIN_QUALIFIED = 8
+
+# Caches for search listings, keyed by (title, location), and parsed postings, keyed by job id.
+# Set SCRAPER_CACHE_PATH to keep them in an SQLite file instead of in memory
+CACHE_PATH = os.environ.get("SCRAPER_CACHE_PATH")
+SEARCH_CACHE_TTL = int(os.environ.get("SEARCH_CACHE_TTL", 15 * 60))
+POSTING_CACHE_TTL = int(os.environ.get("POSTING_CACHE_TTL", 24 * 60 * 60))
+search_cache = make_cache(CACHE_PATH, maxsize=512, ttl=SEARCH_CACHE_TTL, table="search_cache")
+posting_cache = make_cache(CACHE_PATH, maxsize=10000, ttl=POSTING_CACHE_TTL, table="posting_cache")
+metrics.register_cache("search", search_cache)
+metrics.register_cache("posting", posting_cache)
+
+
+# Function to normalize a search so that equivalent (title, location) pairs share a cache entry
+def search_key(title, location):
+    return (" ".join(str(title).lower().split()), " ".join(str(location).lower().split()))
+
+
+# Function to get the hit/miss counters of both caches
+def cache_stats():
+    return {"search": search_cache.stats(), "posting": posting_cache.stats()}
+
+
+# Function to fetch a LinkedIn job posting and extract its details, skills and qualifications
+def parse_job_posting(job_id, timeout=REQUEST_TIMEOUT):
+    cached = posting_cache.get(job_id)
+    if cached is not None:
+        return cached
+
+    # Construct the URL for the job using the job ID
+    job_url = f"{LINKEDIN_BASE_URL}/jobs-guest/jobs/api/jobPosting/{job_id}"
+
+    # Send a GET request to the job URL and parse the reponse
+    job_response = http_session.get(job_url, timeout=timeout)
+    '''print(job_response.status_code)'''
+    with metrics.stage("posting_parse"):
+        job_post, job_data = parse_posting_html(job_response.text)
+
+    # Extract job tech skills and qualifications
+    with metrics.stage("posting_keywords"):
+        job_post["Skills"], job_post["Qualifications"] = extract_skills_and_qualifications(job_data)
+
+    posting_cache.set(job_id, job_post)
+    return job_post
+
+
+# Function to extract the top card fields and the description sections of a posting page,
+# returned as (job_post, job_data)
+def parse_posting_html(html):
+    if HTML_PARSER == "lxml" and lxml_html is not None:
+        return _parse_posting_lxml(html)
+
+    # Only the top card and the description are built into a tree; the rest of the page is skipped
+    job_soup = BeautifulSoup(html, HTML_PARSER, parse_only=POSTING_STRAINER)
+    if not job_soup.contents:
+        # Neither region was found (the page layout changed), so look through the whole page
+        job_soup = BeautifulSoup(html, HTML_PARSER)
+
+    # Create a dictionary to store job details
+    job_post = dict.fromkeys(TOP_CARD_FIELDS)
+    description_section = None
+
+    # One pass over the tags picks up every field; a tag matches when it has all the class tokens
+    # of a field, in any order and alongside any other classes
+    missing = dict(TOP_CARD_FIELDS)
+    for tag in job_soup.find_all(True):
+        classes = tag.get("class")
+        if not classes:
+            continue
+        classes = set(classes)
+        for field, required in list(missing.items()):
+            if required <= classes:
+                job_post[field] = tag.get_text().strip()
+                del missing[field]
+        if description_section is None and DESCRIPTION_CLASS in classes:
+            description_section = tag
+        if not missing and description_section is not None:
+            break
+
+    return job_post, extract_description_details(description_section)
+
+
+# lxml variant of parse_posting_html: the same single pass over the page tree
+def _parse_posting_lxml(html):
+    job_post = dict.fromkeys(TOP_CARD_FIELDS)
+    description_section = None
+    if not html.strip():
+        return job_post, extract_description_details(None)
+
+    missing = dict(TOP_CARD_FIELDS)
+    for element in lxml_html.fromstring(html).iter():
+        classes = _classes(element)
+        if not classes:
+            continue
+        for field, required in list(missing.items()):
+            if required <= classes:
+                job_post[field] = element.text_content().strip()
+                del missing[field]
+        if description_section is None and DESCRIPTION_CLASS in classes:
+            description_section = element
+        if not missing and description_section is not None:
+            break
+
+    return job_post, _description_details_lxml(description_section)
+
+
+# Text of an lxml element the way BeautifulSoup's get_text(strip=True) joins it
+def _stripped_text(element):
+    return "".join(text.strip() for text in element.itertext())
+
+
+# lxml variant of extract_description_details
+def _description_details_lxml(description_section):
+    if description_section is None:
+        return extract_description_details(None)
+
+    current_category = "General Information"
+    job_details = {current_category: []}
+    for element in description_section:
+        # Comments and processing instructions have no tag name
+        if not isinstance(element.tag, str):
+            continue
+        if element.tag in ["h3", "p", "strong"]:
+            current_category = _stripped_text(element)
+            if current_category not in job_details:
+                job_details[current_category] = []
+        elif element.tag == "ul":
+            job_details[current_category].extend(_stripped_text(li) for li in element.iter("li"))
+        elif element.tag != "br":
+            text = _stripped_text(element)
+            if text:
+                job_details[current_category].append(text)
+    return job_details
+
+
+# Function to score a parsed job posting against the user's skills and qualifications
+def score_job_posting(posting, apply_link, user_skills, user_qualifications):
+    job_post = dict(posting)
+    skills = set(posting["Skills"])
+    qualifications = set(posting["Qualifications"])
+
+    #Matching the skill with individual job skills
+    Skill_Match=0
+    for skill in user_skills:
+        if skill in skills:
+            Skill_Match += 1
+
+    #Matching the qualification with individual job qualification
+    Qualification_Match=0
+    for qualification in user_qualifications:
+        if qualification in qualifications or len(qualifications)==0:
+            Qualification_Match = 1
+            break
+
+    #Add the match in dictionary
+    job_post["Skill Match"] = Skill_Match
+    job_post["Qualification Match"] = Qualification_Match
+
+    # Adding the Apply link
+    job_post["Apply Link"] = apply_link
+
+    return job_post
+
+
+# Function to fetch a single LinkedIn job posting and score it against the user
+def fetch_job_posting(job_id, apply_link, user_skills, user_qualifications, timeout=REQUEST_TIMEOUT):
+    posting = parse_job_posting(job_id, timeout)
+    job_post = score_job_posting(posting, apply_link, user_skills, user_qualifications)
+    job_post["Job ID"] = job_id
+    return job_post
+
+
+# Function to fetch a job posting, returning None instead of raising so one bad posting is skipped
+def _safe_fetch_job_posting(job_id, apply_link, user_skills, user_qualifications, timeout):
+    try:
+        return fetch_job_posting(job_id, apply_link, user_skills, user_qualifications, timeout)
+    except Exception:
+        return None
+
+
+# Function to fetch all job postings, concurrently when max_workers > 1. Results keep the order of
+# link_dict; postings not fetched within deadline seconds are left out
+def fetch_job_postings(link_dict, user_skills, user_qualifications, max_workers=MAX_WORKERS, timeout=REQUEST_TIMEOUT,
+                       deadline=FETCH_DEADLINE):
+    if max_workers <= 1 or len(link_dict) <= 1:
+        give_up = time.monotonic() + deadline
+        results = []
+        for job_id, link in link_dict.items():
+            if time.monotonic() >= give_up:
+                break
+            results.append(_safe_fetch_job_posting(job_id, link, user_skills, user_qualifications, timeout))
+    else:
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(link_dict)))
+        try:
+            fetch = metrics.propagate(_safe_fetch_job_posting)
+            futures = [executor.submit(fetch, job_id, link, user_skills, user_qualifications, timeout)
+                       for job_id, link in link_dict.items()]
+            done, _ = wait(futures, timeout=deadline)
+            results = [future.result() if future in done else None for future in futures]
+        finally:
+            # Don't wait for postings still running past the deadline, and drop the queued ones
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    return [job_post for job_post in results if job_post is not None]
+
+
+# Function to yield the job postings one by one as soon as each is fetched and scored (completion
+# order), until deadline seconds have passed
+def iter_job_postings(link_dict, user_skills, user_qualifications, max_workers=MAX_WORKERS, timeout=REQUEST_TIMEOUT,
+                      deadline=FETCH_DEADLINE):
+    if not link_dict:
+        return
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(link_dict))))
+    try:
+        fetch = metrics.propagate(_safe_fetch_job_posting)
+        futures = [executor.submit(fetch, job_id, link, user_skills, user_qualifications, timeout)
+                   for job_id, link in link_dict.items()]
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                job_post = future.result()
+                if job_post is not None:
+                    yield job_post
+        except TimeoutError:
+            pass
+    finally:
+        # Stop fetching once the deadline passed or the consumer went away early
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Function to search LinkedIn and return the job ids of the listing with their apply links
+# (start is the offset of the first posting, a multiple of PAGE_SIZE)
+def search_job_links(title, location, timeout=REQUEST_TIMEOUT, start=0):
+    key = search_key(title, location) + (start,)
+    cached = search_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
     # Construct the URL for LinkedIn job search
-    list_url = f"https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords={title}&location={location}&f_TP=1"
+    list_url = f"{LINKEDIN_BASE_URL}/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords={title}&location={location}&f_TP=1&start={start}"
 
     # Send a GET request to the URL and store the response
-    response = requests.get(list_url)
+    response = http_session.get(list_url, timeout=timeout)
+
+    with metrics.stage("search_parse"):
+        link_dict = parse_search_html(response.text)
 
-    #Get the HTML, parse the response and find all list items(jobs postings)
-    list_data = response.text
-    list_soup = BeautifulSoup(list_data, "html.parser")
-    page_jobs = list_soup.find_all("li")
+    search_cache.set(key, dict(link_dict))
+    return link_dict
 
-    #Create an empty list to store the job postings
-    id_list = []
+
+# Function to get the job ids and apply links of a search results page
+def parse_search_html(list_data):
+    if HTML_PARSER == "lxml" and lxml_html is not None:
+        return _parse_search_lxml(list_data)
+
+    #Get the HTML, parse only the job cards (with their links) of the postings
+    list_soup = BeautifulSoup(list_data, HTML_PARSER, parse_only=SEARCH_CARD_STRAINER)
+
+    #Create an empty dictionary to store the job postings
     link_dict = {}
 
     #Itetrate through job postings to find job ids
-    for i, job in enumerate(page_jobs):
-        base_card_div = job.find("div", {"class": "base-card"})
+    for base_card_div in list_soup.find_all("div", class_="base-card"):
+        if not base_card_div.get("data-entity-urn"):
+            continue
         job_id = base_card_div.get("data-entity-urn").split(":")[3]
 
-        link_tag = job.find("a", {"class": "base-card__full-link"})
+        link_tag = base_card_div.find("a", class_="base-card__full-link")
         # Extract the href attribute
         if link_tag and link_tag.has_attr("href"):
             href_link = link_tag["href"]
@@ -130,106 +423,161 @@ def linkdin(title, location, user_skills, user_qualifications):
             href_link = None  # Handle case where no href is found
         link_dict[job_id]= href_link
         '''print(job_id)'''
-        id_list.append(job_id)
-
-    # Initialize an empty list to store job information
-    job_list = []
-
-    # Loop through the list of job IDs and get each URL
-    for key in link_dict:
-        job_id = key
-        # Construct the URL for each job using the job ID
-        job_url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
-
-        # Send a GET request to the job URL and parse the reponse
-        job_response = requests.get(job_url)
-        '''print(job_response.status_code)'''
-        job_soup = BeautifulSoup(job_response.text, "html.parser")
-
-        # Create a dictionary to store job details
-        job_post = {}
 
-        # Try to extract and store the job title
-        try:
-            job_post["Job Title"] = job_soup.find("h2", {"class":"top-card-layout__title font-sans text-lg papabear:text-xl font-bold leading-open text-color-text mb-0 topcard__title"}).text.strip()
-        except:
-            job_post["Job Title"] = None
-
-        # Try to extract and store the company name
-        try:
-            job_post["Company Name"] = job_soup.find("a", {"class": "topcard__org-name-link topcard__flavor--black-link"}).text.strip()
-        except:
-            job_post["Company Name"] = None
+    return link_dict
 
-        # Try to extract and store the company location
-        try:
-            job_post["Location"] = job_soup.find("span", {"class": "topcard__flavor topcard__flavor--bullet"}).text.strip()
-        except:
-            job_post["Location"] = None
 
-        # Try to extract and store the time posted
-        try:
-            job_post["Time Posted"] = job_soup.find("span", {"class": "posted-time-ago__text topcard__flavor--metadata"}).text.strip()
-        except:
-            job_post["Time Posted"] = None
-
-        # Try to extract and store the number of applicants
-        try:
-            job_post["No of Applicants"] = job_soup.find("span", {"class": "num-applicants__caption topcard__flavor--metadata topcard__flavor--bullet"}).text.strip()
-        except:
-            job_post["No of Applicants"] = None
-
-        # Adding the Apply link
-        try:
-            job_post["Apply Link"] = link_dict[job_id]
-        except:
-            job_post["Apply Link"] = None
-
-        # Extract job tech skills
-        job_data = extract_job_details(job_soup)
-        skills = extract_skills(job_data, known_tech_skills)
-
-        # Extract job tech qualifications
-        qualifications = extract_qualifications(job_data, known_tech_qualifications)
-        '''print(qualifications)'''
-
-        #Matching the skill with individual job skills
-        Skill_Match=0
-        for skill in user_skills:
-            if skill in skills:
-                Skill_Match += 1
-
-        #Matching the qualification with individual job qualification
-        Qualification_Match=0
-        for qualification in user_qualifications:
-            if qualification in qualifications or len(qualifications)==0:
-                Qualification_Match = 1
-                break
-
-        #Add the match in dictionary
-        job_post["Skill Match"] = Skill_Match
-        job_post["Qualification Match"] = Qualification_Match
-
-        # Add extracted skills and qualification to the dictionary
-        job_post["Skills"] = skills
-        job_post["Qualifications"] = qualifications
-
-        # Adding the Apply link
-        job_post["Apply Link"] = link_dict.get(job_id, "NONE")
-
-        # Append the job details to the job_list
-        job_list.append(job_post)
-    
-    # Create a pandas DataFrame using the list of job dictionaries 'job_list'
-    jobs_df = pd.DataFrame(job_list)
-
-    # Filter where Qualification match is 1
-    filter_jobs = jobs_df[jobs_df['Qualification Match']==1]
+# lxml variant of parse_search_html
+def _parse_search_lxml(list_data):
+    link_dict = {}
+    if not list_data.strip():
+        return link_dict
+    for base_card_div in lxml_html.fromstring(list_data).iter("div"):
+        if "base-card" not in _classes(base_card_div) or not base_card_div.get("data-entity-urn"):
+            continue
+        job_id = base_card_div.get("data-entity-urn").split(":")[3]
+        link_tag = next((a for a in base_card_div.iter("a") if "base-card__full-link" in _classes(a)), None)
+        link_dict[job_id] = link_tag.get("href") if link_tag is not None else None
+    return link_dict
+
+
+# Function to keep the postings that match a qualification and return the best n as a DataFrame.
+# Postings are scored together over the skill vocabulary (see scoring.py); only the top n rows
+# are turned into a DataFrame
+def top_matches(job_list, user_skills, n=4, columns=JOB_COLUMNS, weights=None):
+    with metrics.stage("rank"):
+        ranked = scoring.rank_postings(job_list, user_skills, n=n, weights=weights)
+    return pd.DataFrame([job_post for _, job_post in ranked], columns=columns,
+                        index=[index for index, _ in ranked])
+
+
+# Function to fetch search pages for several roles and yield their scored postings, a batch of
+# PAGE_CONCURRENCY pages at a time. roles is a list of (role, probability) pairs; a job id found
+# on several pages or roles is kept once, under its most likely role. With ordered=True each batch
+# keeps the listing order, otherwise postings come out as soon as they are fetched
+def iter_paged_postings(roles, location, user_skills, user_qualifications, max_workers=MAX_WORKERS,
+                        timeout=REQUEST_TIMEOUT, max_pages=MAX_PAGES, max_postings=MAX_POSTINGS,
+                        min_qualified=MIN_QUALIFIED, ordered=True):
+    roles = sorted(roles, key=lambda role: role[1], reverse=True)
+    active_roles = list(roles)
+    job_roles = {}
+    qualified = 0
+
+    for first_page in range(0, max_pages, PAGE_CONCURRENCY):
+        pages = range(first_page, min(max_pages, first_page + PAGE_CONCURRENCY))
+
+        # Fetch every (role, page) search of this batch concurrently. A search that still fails after
+        # http_session's retries is skipped (None): it neither ends the role's paging nor gets cached
+        searches = [(role, probability, page) for role, probability in active_roles for page in pages]
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(searches)))) as executor:
+            search = metrics.propagate(search_job_links)
+            futures = [executor.submit(search, role, location, timeout, page * PAGE_SIZE)
+                       for role, _, page in searches]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception:
+                    results.append(None)
+
+        # Merge the new job ids, stopping paging a role once one of its pages comes back empty
+        link_dict = {}
+        exhausted = set()
+        for (role, probability, page), page_links in zip(searches, results):
+            if page_links is None:
+                continue
+            if not page_links:
+                exhausted.add(role)
+            for job_id, link in page_links.items():
+                if job_id not in job_roles and len(job_roles) < max_postings:
+                    job_roles[job_id] = (role, probability)
+                    link_dict[job_id] = link
+        active_roles = [role for role in active_roles if role[0] not in exhausted]
+
+        if ordered:
+            job_posts = fetch_job_postings(link_dict, user_skills, user_qualifications, max_workers, timeout)
+        else:
+            job_posts = iter_job_postings(link_dict, user_skills, user_qualifications, max_workers, timeout)
+        batch = []
+        for job_post in job_posts:
+            qualified += job_post["Qualification Match"]
+            batch.append(job_post)
+            yield add_role_score(job_post, *job_roles[job_post["Job ID"]])
+
+        # Keep the parsed postings in the local job store, when one is configured
+        store = job_store.get_store()
+        if store is not None:
+            for role, _ in roles:
+                store.add_postings([job_post for job_post in batch if job_post["Role"] == role], role, location)
+
+        # Stop early once there are enough qualified postings or the budget is used up
+        if qualified >= min_qualified or len(job_roles) >= max_postings or not active_roles:
+            break
+
+
+# Function to weight the skill match of a posting with the probability of the role it was found for
+def add_role_score(job_post, role, probability):
+    job_post["Role"] = role
+    job_post["Role Probability"] = probability
+    job_post["Score"] = job_post["Skill Match"] * probability
+    return job_post
+
+
+def linkdin(title, location, user_skills, user_qualifications, max_workers=MAX_WORKERS, timeout=REQUEST_TIMEOUT,
+            max_pages=MAX_PAGES, max_postings=MAX_POSTINGS, min_qualified=MIN_QUALIFIED, weights=None):
+    # Fetch the search pages and every job posting on them; a slow or failed posting is dropped
+    job_list = list(iter_paged_postings([(title, 1.0)], location, user_skills, user_qualifications, max_workers,
+                                        timeout, max_pages, max_postings, min_qualified))
 
     # Sort by 'Match' in descending order and display top 4
-    top_matches = filter_jobs.sort_values(by='Skill Match', ascending=False).head(4)
-
-    return top_matches
+    return top_matches(job_list, user_skills, weights=weights)
+
+
+# Function to search several predicted roles at once. roles is a list of (role, probability) pairs;
+# postings are merged by job id and ranked by their score weighted with the probability of their role
+def linkdin_multi(roles, location, user_skills, user_qualifications, max_workers=MAX_WORKERS, timeout=REQUEST_TIMEOUT, n=4,
+                  max_pages=MAX_PAGES, max_postings=MAX_POSTINGS, min_qualified=MIN_QUALIFIED, weights=None):
+    job_list = list(iter_paged_postings(roles, location, user_skills, user_qualifications, max_workers,
+                                        timeout, max_pages, max_postings, min_qualified))
+
+    return top_matches(job_list, user_skills, n=n, columns=JOB_COLUMNS + ["Role", "Role Probability", "Score"],
+                       weights=weights)
+
+
+# Generator variant of linkdin_multi: yields every scored posting as soon as it is parsed
+def linkdin_multi_stream(roles, location, user_skills, user_qualifications, max_workers=MAX_WORKERS, timeout=REQUEST_TIMEOUT,
+                         max_pages=MAX_PAGES, max_postings=MAX_POSTINGS, min_qualified=MIN_QUALIFIED):
+    yield from iter_paged_postings(roles, location, user_skills, user_qualifications, max_workers,
+                                   timeout, max_pages, max_postings, min_qualified, ordered=False)
+
+
+# Generator variant of linkdin: yields every scored posting as soon as it is parsed
+def linkdin_stream(title, location, user_skills, user_qualifications, max_workers=MAX_WORKERS, timeout=REQUEST_TIMEOUT,
+                   max_pages=MAX_PAGES, max_postings=MAX_POSTINGS, min_qualified=MIN_QUALIFIED):
+    yield from linkdin_multi_stream([(title, 1.0)], location, user_skills, user_qualifications, max_workers,
+                                    timeout, max_pages, max_postings, min_qualified)
+
+
+# Function to follow a stream of scored postings and yield the current top n (qualified postings,
+# best Score first) every time it changes. With user_skills the postings seen so far are re-ranked
+# with the weighted score of scoring.py, otherwise by the Score set by add_role_score
+def stream_top_matches(job_posts, n=4, user_skills=None, weights=None):
+    seen = []
+    top_ids = []
+    for job_post in job_posts:
+        if job_post["Qualification Match"] != 1:
+            continue
+        seen.append(job_post)
+        if user_skills is not None:
+            top = [post for _, post in scoring.rank_postings(seen, user_skills, n=n, weights=weights)]
+        else:
+            seen.sort(key=lambda post: (post.get("Score", post["Skill Match"]), post["Skill Match"]), reverse=True)
+            del seen[n:]
+            top = list(seen)
+        if [id(post) for post in top] == top_ids:
+            continue
+        top_ids = [id(post) for post in top]
+        yield top
 
 
 # Example usage
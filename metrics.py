@@ -0,0 +1,386 @@
+import contextvars
+import glob
+import json
+import os
+import threading
+import time
+
+# Instrumentation is off unless METRICS_ENABLED is set; when off every timer is a shared no-op
+ENABLED = os.environ.get("METRICS_ENABLED", "").lower() in ("1", "true", "yes", "on")
+# Append a JSON line with the timed spans of every traced request to this file (needs metrics enabled)
+TRACE_LOG = os.environ.get("METRICS_TRACE_LOG")
+# Directory shared by the processes of a multi-process server (gunicorn workers). Each process
+# writes its metrics to a file there every SNAPSHOT_SECONDS, and render() adds up all the files,
+# so /metrics reports the whole server whichever worker answers the scrape
+MULTIPROC_DIR = os.environ.get("METRICS_MULTIPROC_DIR") or None
+SNAPSHOT_SECONDS = float(os.environ.get("METRICS_SNAPSHOT_SECONDS", 5))
+
+# Prefix of every exported metric name
+PREFIX = "jobrec_"
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+HELP = {
+    "stage_seconds": "Time spent in each pipeline stage",
+    "http_request_seconds": "Time of each outbound HTTP request attempt",
+    "http_requests_total": "Outbound HTTP request attempts by status",
+    "http_retries_total": "Outbound HTTP requests retried",
+    "request_seconds": "Time to answer each Flask endpoint",
+    "errors_total": "Exceptions raised by each stage",
+    "cache_hits_total": "Cache hits",
+    "cache_misses_total": "Cache misses",
+    "cache_hit_ratio": "Cache hit ratio",
+    "cache_size": "Entries in each cache",
+    "tasks": "Background tasks by state",
+}
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_caches = {}
+_collectors = []
+_trace = contextvars.ContextVar("metrics_trace", default=None)
+_trace_lock = threading.Lock()
+_writer_pid = None
+
+
+def configure(enabled=None, trace_log=None, multiproc_dir=None):
+    global ENABLED, TRACE_LOG, MULTIPROC_DIR
+    if enabled is not None:
+        ENABLED = bool(enabled)
+    if trace_log is not None:
+        TRACE_LOG = trace_log or None
+    if multiproc_dir is not None:
+        MULTIPROC_DIR = multiproc_dir or None
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+# Label values are kept as strings, so series with a numeric and a text value (an HTTP status or
+# an exception name) still sort together
+def _key(name, labels):
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+# Function to record a duration (seconds) in the histogram name{labels}
+def observe(name, value, **labels):
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(value)
+    trace = _trace.get()
+    if trace is not None:
+        trace.add(name, labels, value)
+
+
+# Function to add to the counter name{labels}
+def inc(name, value=1, **labels):
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+# Times a block into a histogram; an exception leaving the block is counted in errors_total
+class Timer:
+    __slots__ = ("name", "labels", "started")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.name, time.perf_counter() - self.started, **self.labels)
+        if exc_type is not None:
+            inc("errors_total", **self.labels)
+        return False
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+# Usage: with metrics.timer("stage_seconds", stage="predict"): ...
+def timer(name, **labels):
+    if not ENABLED:
+        return _NULL_TIMER
+    return Timer(name, labels)
+
+
+# Shortcut for the per-stage timers of the pipeline
+def stage(name):
+    return timer("stage_seconds", stage=name)
+
+
+# Function to export the hit/miss counters of a cache (anything with a stats() method)
+def register_cache(name, cache):
+    _caches[name] = cache
+
+
+# Function to add a callable returning extra gauges as [(name, labels, value), ...] at scrape time
+def register_collector(collector):
+    _collectors.append(collector)
+
+
+# Spans timed while a request is traced, written as one JSON line when the request ends
+class Trace:
+    def __init__(self, name, info):
+        self.name = name
+        self.info = info
+        self.started = time.perf_counter()
+        self.spans = []
+        self.lock = threading.Lock()
+
+    def add(self, name, labels, seconds):
+        end = time.perf_counter() - self.started
+        with self.lock:
+            self.spans.append(dict(labels, metric=name, start=round(end - seconds, 6), seconds=round(seconds, 6)))
+
+    def record(self, error=None):
+        return {
+            "trace": self.name,
+            "time": time.time(),
+            "seconds": round(time.perf_counter() - self.started, 6),
+            "error": error,
+            **self.info,
+            "spans": self.spans,
+        }
+
+
+# Context manager tracing everything timed inside it (and in threads started with propagate)
+class trace:
+    def __init__(self, name, **info):
+        self.name = name
+        self.info = info
+        self.token = None
+
+    def __enter__(self):
+        if ENABLED and TRACE_LOG:
+            self.trace = Trace(self.name, self.info)
+            self.token = _trace.set(self.trace)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.token is None:
+            return False
+        try:
+            _trace.reset(self.token)
+        except ValueError:
+            # Exited from another context, e.g. a generator closed by a different thread
+            pass
+        self.token = None
+        line = json.dumps(self.trace.record(None if exc is None else str(exc) or exc_type.__name__), default=str)
+        with _trace_lock:
+            with open(TRACE_LOG, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        return False
+
+
+# Function to make func run with the caller's trace when handed to a thread pool
+def propagate(func):
+    if _trace.get() is None:
+        return func
+    context = contextvars.copy_context()
+    # A context can only be entered by one thread at a time, so every call runs in its own copy
+    return lambda *args, **kwargs: context.copy().run(func, *args, **kwargs)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+def _header(lines, name, kind):
+    lines.append(f"# HELP {PREFIX}{name} {HELP.get(name, name)}")
+    lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+
+# Cache statistics and collector values of this process as [(name, labels, value), ...]
+def _gauges():
+    gauges = []
+    for cache_name, cache in sorted(_caches.items()):
+        stats = cache.stats()
+        labels = (("cache", cache_name),)
+        gauges += [("cache_hits_total", labels, stats["hits"]), ("cache_misses_total", labels, stats["misses"]),
+                   ("cache_hit_ratio", labels, stats["hit_ratio"]), ("cache_size", labels, stats["size"])]
+    for collector in _collectors:
+        gauges += [_key(name, labels) + (value,) for name, labels, value in collector()]
+    return gauges
+
+
+def _snapshot_path(pid):
+    return os.path.join(MULTIPROC_DIR, f"metrics_{pid}.json")
+
+
+# Function to write this process's metrics to its file in MULTIPROC_DIR
+def write_snapshot():
+    if not MULTIPROC_DIR:
+        return
+    with _lock:
+        histograms = [[name, labels, histogram.counts, histogram.sum, histogram.count]
+                      for (name, labels), histogram in _histograms.items()]
+        counters = [[name, labels, value] for (name, labels), value in _counters.items()]
+    snapshot = {"pid": os.getpid(), "buckets": BUCKETS, "histograms": histograms, "counters": counters,
+                "gauges": _gauges()}
+    path = _snapshot_path(os.getpid())
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    os.replace(path + ".tmp", path)
+
+
+# Function to start the thread writing this process's snapshot. Call it in each worker after the
+# fork (gunicorn's post_fork), never in a master that forks later
+def start_writer():
+    global _writer_pid
+    if not MULTIPROC_DIR or _writer_pid == os.getpid():
+        return
+    _writer_pid = os.getpid()
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+    def loop():
+        while True:
+            time.sleep(SNAPSHOT_SECONDS)
+            try:
+                write_snapshot()
+            except OSError:
+                pass
+
+    threading.Thread(target=loop, name="metrics-writer", daemon=True).start()
+
+
+# Function to remove the snapshots of earlier runs, e.g. when the server starts
+def clear_snapshots():
+    if MULTIPROC_DIR:
+        os.makedirs(MULTIPROC_DIR, exist_ok=True)
+        for path in glob.glob(os.path.join(MULTIPROC_DIR, "metrics_*.json")):
+            os.remove(path)
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+# Function to add up the snapshots of every process. Histograms and counters of processes that
+# have exited still count; their gauges (cache sizes, running tasks) no longer do
+def _merge_snapshots():
+    histograms = {}
+    counters = {}
+    gauges = {}
+    for path in glob.glob(os.path.join(MULTIPROC_DIR, "metrics_*.json")):
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for name, labels, counts, total, count in snapshot["histograms"]:
+            key = (name, tuple(map(tuple, labels)))
+            histogram = histograms.get(key)
+            if histogram is None:
+                histogram = histograms[key] = Histogram(tuple(snapshot["buckets"]))
+            histogram.counts = [a + b for a, b in zip(histogram.counts, counts)]
+            histogram.sum += total
+            histogram.count += count
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        alive = snapshot["pid"] == os.getpid() or _process_alive(snapshot["pid"])
+        for name, labels, value in snapshot["gauges"]:
+            if alive or name.endswith("_total"):
+                key = (name, tuple(map(tuple, labels)))
+                gauges[key] = gauges.get(key, 0) + value
+
+    # A ratio can't be added up: recompute it from the merged hits and misses
+    for (name, labels) in list(gauges):
+        if name == "cache_hit_ratio":
+            hits = gauges.get(("cache_hits_total", labels), 0)
+            total = hits + gauges.get(("cache_misses_total", labels), 0)
+            gauges[(name, labels)] = hits / total if total else 0.0
+    return histograms, counters, [key + (value,) for key, value in gauges.items()]
+
+
+# Function to render every metric in the Prometheus text exposition format
+def render():
+    lines = []
+    if MULTIPROC_DIR:
+        write_snapshot()
+        histograms, counters, gauges = _merge_snapshots()
+        histograms = sorted(histograms.items())
+        counters = sorted(counters.items())
+    else:
+        with _lock:
+            histograms = sorted(_histograms.items())
+            counters = sorted(_counters.items())
+        gauges = _gauges()
+
+    seen = set()
+    for (name, labels), histogram in histograms:
+        if name not in seen:
+            seen.add(name)
+            _header(lines, name, "histogram")
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f"{PREFIX}{name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+        lines.append(f"{PREFIX}{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+        lines.append(f"{PREFIX}{name}_sum{_format_labels(labels)} {histogram.sum}")
+        lines.append(f"{PREFIX}{name}_count{_format_labels(labels)} {histogram.count}")
+
+    for (name, labels), value in counters:
+        if name not in seen:
+            seen.add(name)
+            _header(lines, name, "counter")
+        lines.append(f"{PREFIX}{name}{_format_labels(labels)} {value}")
+
+    # Samples of one metric have to be listed together
+    gauges.sort(key=lambda gauge: gauge[:2])
+    for name, labels, value in gauges:
+        if name not in seen:
+            seen.add(name)
+            _header(lines, name, "counter" if name.endswith("_total") else "gauge")
+        lines.append(f"{PREFIX}{name}{_format_labels(labels)} {value}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,166 @@
+import json
+import os
+import sys
+import threading
+import time
+
+import joblib
+
+# Paths are built from this file's location so they work on every OS and from any working directory
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.environ.get("MODELS_DIR", os.path.join(BASE_DIR, "models"))
+
+# Set MODEL_MMAP_MODE=r to memory-map the numpy arrays inside the pickles, so that forked
+# workers share the pages instead of each holding a private copy
+MMAP_MODE = os.environ.get("MODEL_MMAP_MODE") or None
+
+SPACY_MODEL = os.environ.get("SPACY_MODEL", "en_core_web_sm")
+
+# Saved models and encoders, by the name they are requested with
+ARTIFACTS = {
+    "model": "model.pkl",
+    "mlb": "mlb_skills.pkl",
+    "degree_encoder": "degree_encoder.pkl",
+    "domain_encoder": "domain_encoder.pkl",
+    "job_encoder": "job_encoder.pkl",
+}
+
+# Written by train_model.py next to the artifacts: feature column order, version and training metrics
+METADATA_FILE = "model_meta.json"
+# Version of the layout described by the metadata; artifacts with another version are refused
+FORMAT_VERSION = 1
+
+
+class IncompatibleModelError(ValueError):
+    pass
+
+
+_loaded = {}
+_load_seconds = {}
+_lock = threading.RLock()
+
+
+def artifact_path(name, models_dir=None):
+    return os.path.join(models_dir or MODELS_DIR, ARTIFACTS[name])
+
+
+# Function to load a value once per process, timing how long the load took
+def _load_once(name, loader):
+    if name in _loaded:
+        return _loaded[name]
+    with _lock:
+        if name not in _loaded:
+            start = time.perf_counter()
+            _loaded[name] = loader()
+            _load_seconds[name] = time.perf_counter() - start
+    return _loaded[name]
+
+
+# Function to get a saved model or encoder, loading it on first use
+def get(name):
+    if name not in ARTIFACTS:
+        raise KeyError(f"Unknown model artifact: {name}")
+    return _load_once(name, lambda: joblib.load(artifact_path(name), mmap_mode=MMAP_MODE))
+
+
+def metadata_path(models_dir=None):
+    return os.path.join(models_dir or MODELS_DIR, METADATA_FILE)
+
+
+# Function to get the training metadata of the artifacts, or None for artifacts saved without it
+def get_metadata():
+    def load():
+        try:
+            with open(metadata_path(), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+    return _load_once("metadata", load)
+
+
+# Function to get the shared spaCy pipeline, loading it on first use
+def get_nlp():
+    def load():
+        import spacy
+        return spacy.load(SPACY_MODEL)
+    return _load_once("spacy", load)
+
+
+# Function to make sure an NLTK data package is available, downloading it only when missing
+def ensure_nltk_data(package="punkt", resource_path="tokenizers/punkt"):
+    def load():
+        import nltk
+        try:
+            nltk.data.find(resource_path)
+        except LookupError:
+            nltk.download(package, quiet=True)
+        return True
+    return _load_once(f"nltk:{package}", load)
+
+
+# Function to load everything up front, e.g. in a server master process before it forks workers
+def preload(names=None, include_nlp=True):
+    for name in names or ARTIFACTS:
+        get(name)
+    get_metadata()
+    if include_nlp:
+        get_nlp()
+    return load_stats()
+
+
+def is_loaded(name):
+    return name in _loaded
+
+
+# Function to re-save the artifacts uncompressed, the format joblib can memory-map
+def export_compact(out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    for name in ARTIFACTS:
+        joblib.dump(get(name), artifact_path(name, out_dir), compress=0)
+    if get_metadata() is not None:
+        with open(metadata_path(out_dir), "w", encoding="utf-8") as f:
+            json.dump(get_metadata(), f, indent=2)
+    return out_dir
+
+
+# Resident memory of this process in MB
+def resident_memory_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in KB elsewhere
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# Load time of every artifact loaded so far and the current resident memory
+def load_stats():
+    return {
+        "load_seconds": dict(_load_seconds),
+        "total_seconds": sum(_load_seconds.values()),
+        "resident_memory_mb": resident_memory_mb(),
+        "mmap_mode": MMAP_MODE,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Report model cold-start time and memory, or export compact artifacts")
+    parser.add_argument("--export", metavar="DIR", help="write uncompressed, memory-mappable copies of the artifacts to DIR")
+    parser.add_argument("--no-nlp", action="store_true", help="skip loading the spaCy pipeline")
+    args = parser.parse_args()
+
+    before = resident_memory_mb()
+    stats = preload(include_nlp=not args.no_nlp)
+    print(f"Resident memory before loading: {before:.1f} MB")
+    for name, seconds in stats["load_seconds"].items():
+        print(f"  {name:<16} {seconds * 1000:8.1f} ms")
+    print(f"Cold start total: {stats['total_seconds'] * 1000:.1f} ms")
+    print(f"Resident memory after loading: {stats['resident_memory_mb']:.1f} MB (mmap_mode={MMAP_MODE})")
+
+    if args.export:
+        print("Exported artifacts to", export_compact(args.export))
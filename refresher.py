@@ -0,0 +1,223 @@
+import argparse
+import logging
+import os
+import threading
+import time
+
+import http_session
+import job_store
+import linkdin_jobs
+import metrics
+import model_registry
+
+# Only one process per store crawls; the lock file is how the others know (Unix only)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Locations crawled for every role (comma separated), how often, and for how long postings are kept
+REFRESH_LOCATIONS = [location.strip() for location in os.environ.get("REFRESH_LOCATIONS", "India").split(",") if location.strip()]
+REFRESH_INTERVAL = int(os.environ.get("REFRESH_INTERVAL", 60 * 60))
+POSTING_TTL = int(os.environ.get("POSTING_TTL", 3 * 24 * 60 * 60))
+# Crawl budget: outbound requests per second and the most requests a single cycle may spend
+CRAWL_RATE = float(os.environ.get("CRAWL_RATE", 0.5))
+CRAWL_REQUESTS_PER_CYCLE = int(os.environ.get("CRAWL_REQUESTS_PER_CYCLE", 500))
+# Search pages crawled for each (role, location)
+CRAWL_PAGES = int(os.environ.get("CRAWL_PAGES", 2))
+# Run the refresher inside the web app (see start_in_app) instead of as a separate process
+REFRESH_IN_APP = os.environ.get("REFRESH_IN_APP", "").lower() in ("1", "true", "yes", "on")
+# Seconds between attempts to take over crawling while another process holds the lock
+LOCK_RETRY_SECONDS = 60
+
+logger = logging.getLogger(__name__)
+
+
+# Background crawler that keeps the job store warm for every role the model can predict, so that
+# user requests can be answered from the store without waiting on the network
+class Refresher:
+    def __init__(self, store, locations=REFRESH_LOCATIONS, roles=None, interval=REFRESH_INTERVAL,
+                 posting_ttl=POSTING_TTL, rate=CRAWL_RATE, requests_per_cycle=CRAWL_REQUESTS_PER_CYCLE,
+                 pages=CRAWL_PAGES, lock_path=None):
+        self.store = store
+        self.locations = list(locations)
+        self.roles = list(roles) if roles else None
+        self.interval = interval
+        self.posting_ttl = posting_ttl
+        self.requests_per_cycle = requests_per_cycle
+        self.pages = pages
+        # Crawler requests also go through the shared http_session limiter; this bucket keeps the
+        # crawler to its own, smaller share
+        self.budget = http_session.TokenBucket(rate, max(1, rate))
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.requests = 0
+        self.errors = 0
+        self.lock_path = lock_path
+        self.lock_file = None
+
+    # Every class of the job encoder, unless roles were given
+    def crawl_roles(self):
+        if self.roles is None:
+            return [str(role) for role in model_registry.get("job_encoder").classes_]
+        return self.roles
+
+    # Function to take one request from the budget; False once the cycle budget is spent or on stop
+    def _spend(self):
+        if self.requests >= self.requests_per_cycle or self.stop_event.is_set():
+            return False
+        while not self.budget.acquire(timeout=1):
+            if self.stop_event.is_set():
+                return False
+        self.requests += 1
+        return True
+
+    # Function to log a failed step and count it in errors_total under its stage
+    def _failed(self, stage, message, *args):
+        self.errors += 1
+        metrics.inc("errors_total", stage=stage)
+        logger.warning(message, *args)
+
+    # Function to crawl the search pages of one (role, location), fetching only unseen job ids
+    def crawl_search(self, role, location):
+        new_postings = 0
+        for page in range(self.pages):
+            if not self._spend():
+                break
+            try:
+                link_dict = linkdin_jobs.search_job_links(role, location, start=page * linkdin_jobs.PAGE_SIZE)
+            except Exception as e:
+                self._failed("refresh_search", "Search page %d of %r in %r failed: %s", page, role, location, e)
+                break
+            if not link_dict:
+                break
+
+            # Postings already in the store are only marked as still listed for this search
+            self.store.record_search(role, location, [job_id for job_id in link_dict if self.store.has(job_id)])
+
+            postings = []
+            for job_id, link in link_dict.items():
+                if self.store.has(job_id):
+                    continue
+                if not self._spend():
+                    break
+                try:
+                    posting = linkdin_jobs.parse_job_posting(job_id)
+                except Exception as e:
+                    self._failed("refresh_posting", "Posting %s failed: %s", job_id, e)
+                    continue
+                postings.append(dict(posting, **{"Job ID": job_id, "Apply Link": link}))
+            self.store.add_postings(postings, role, location)
+            new_postings += len(postings)
+        return new_postings
+
+    # Function to run one refresh cycle: expire old postings, then crawl every role and location
+    def run_once(self):
+        started = time.time()
+        self.requests = 0
+        self.errors = 0
+        expired = self.store.expire(self.posting_ttl)
+        new_postings = 0
+        for role in self.crawl_roles():
+            for location in self.locations:
+                if self.requests >= self.requests_per_cycle or self.stop_event.is_set():
+                    break
+                new_postings += self.crawl_search(role, location)
+        return {
+            "expired": expired,
+            "new_postings": new_postings,
+            "requests": self.requests,
+            "errors": self.errors,
+            "seconds": time.time() - started,
+            "store": self.store.stats(),
+        }
+
+    # Function to take the crawl lock, or keep it once taken; True when this process should crawl
+    def holds_lock(self):
+        if self.lock_path is None or fcntl is None or self.lock_file is not None:
+            return True
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        # Released by the OS when this process exits, so another one can take over
+        self.lock_file = lock_file
+        return True
+
+    def _loop(self):
+        while not self.stop_event.is_set():
+            if not self.holds_lock():
+                self.stop_event.wait(min(self.interval, LOCK_RETRY_SECONDS))
+                continue
+            try:
+                self.run_once()
+            except Exception:
+                # Keep refreshing on the next cycle, but leave a trace: store and database errors
+                # would otherwise go unnoticed for as long as the app runs
+                metrics.inc("errors_total", stage="refresh")
+                logger.exception("Job store refresh failed")
+            self.stop_event.wait(self.interval)
+
+    # Function to start refreshing in a daemon thread
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._loop, name="job-refresher", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+        if self.lock_file is not None:
+            self.lock_file.close()
+            self.lock_file = None
+
+
+def lock_path_for(store):
+    return store.path + ".refresh.lock"
+
+
+_app_refresher = None
+
+
+# Function to start refreshing the shared job store in a daemon thread of this process. Every
+# server worker may call it: the crawl lock lets one of them crawl while the others only read
+# what it stores. Must run after forking (gunicorn's post_fork), never in a preloading master
+def start_in_app(store=None):
+    global _app_refresher
+    store = store or job_store.get_store()
+    if store is None:
+        return None
+    if _app_refresher is None:
+        _app_refresher = Refresher(store, lock_path=lock_path_for(store))
+    return _app_refresher.start()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep the local job store filled with postings for every predictable role")
+    parser.add_argument("--store", default=job_store.JOB_STORE_PATH, help="SQLite job store path (default: $JOB_STORE_PATH)")
+    parser.add_argument("--locations", nargs="+", default=REFRESH_LOCATIONS)
+    parser.add_argument("--roles", nargs="+", help="roles to crawl (default: every class of the job encoder)")
+    parser.add_argument("--interval", type=int, default=REFRESH_INTERVAL, help="seconds between refresh cycles")
+    parser.add_argument("--once", action="store_true", help="run a single refresh cycle and exit")
+    args = parser.parse_args()
+
+    if not args.store:
+        parser.error("a job store path is required (--store or JOB_STORE_PATH)")
+
+    store = job_store.JobStore(args.store)
+    refresher = Refresher(store, locations=args.locations, roles=args.roles, interval=args.interval,
+                          lock_path=lock_path_for(store))
+    if args.once:
+        print(refresher.run_once())
+    else:
+        while True:
+            if refresher.holds_lock():
+                print(refresher.run_once(), flush=True)
+                time.sleep(args.interval)
+            else:
+                time.sleep(min(args.interval, LOCK_RETRY_SECONDS))
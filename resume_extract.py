@@ -1,36 +1,157 @@
+import io
+import multiprocessing
+import os
 import re
+import threading
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 import pdfplumber
-import spacy
-import nltk
-
-nltk.download('punkt')
-nlp = spacy.load("en_core_web_sm")
-
-skill_keywords = [
-    "Python", "Golang", "Go", "AWS", "Java", "JavaScript", "React", "Node.js",
-    "SQL", "MongoDB", "PostgreSQL", "Docker", "Kubernetes", "Git", "HTML", "CSS",
-    "C++", "C#", "Linux", "Flask", "Django", "TensorFlow", "PyTorch", "Hadoop",
-    "Spark", "Machine Learning", "Deep Learning", "REST API", "CI/CD", "Agile",
-    "MySQL", "MongoDB", "GCP", "Azure", "Jenkins", "Ansible", "Terraform", "DevOps",
-    "Matplotlib", "Plotly", "Front-end", "Back-end", "QT", "QML", "GUI",
-    "Geographic Information System", "GIS", "FPGA", "OpenCV", "CUDA", "OpenCL", "Spacy",
-    "NLTK", "Pandas", "NumPy", "Scikit-learn", "Keras", "FastAPI", "GraphQL", "NLP"
-]
-
-qualification_keywords = [
-    'BTech', 'MTech', 'MCA', 'BCA', 'B.Sc', 'M.Sc', 'Bachelor', 'Master', 'Graduate',
-    'Post Graduate', 'PHD', 'Computer Science', 'Engineering', 'Computer Application'
-]
+import model_registry
+from keyword_matcher import SKILL_KEYWORDS, QUALIFICATION_KEYWORDS, get_matcher
 
-# Step 1: Extract text
-def extract_text_from_pdf(path):
-    text = ''
-    with pdfplumber.open(path) as pdf:
-        for page in pdf.pages:
+# pypdfium2 is optional: it reads the PDF text layer directly, far faster than pdfplumber's layout analysis
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+# The spaCy pipeline is shared through model_registry and only loaded when resume_extract.nlp is used
+def __getattr__(name):
+    if name == 'nlp':
+        return model_registry.get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+skill_keywords = SKILL_KEYWORDS
+qualification_keywords = QUALIFICATION_KEYWORDS
+
+# Limits for uploaded PDFs: pages read and size of the file in bytes (None for no limit)
+MAX_PDF_PAGES = 20
+MAX_PDF_BYTES = 10 * 1024 * 1024
+
+class PDFTooLargeError(ValueError):
+    pass
+
+# Text extraction backend ('pdfium' or 'pdfplumber'). The pdfium text is checked and pdfplumber
+# is used instead when it comes back empty or garbled
+PDF_BACKEND = os.environ.get('PDF_BACKEND') or ('pdfium' if pypdfium2 is not None else 'pdfplumber')
+# Documents with at least PDF_PARALLEL_MIN_PAGES pages are split over PDF_WORKERS processes. Off by
+# default: uploads stop at MAX_PDF_PAGES, so this is for long documents read offline with
+# max_pages=None (pass workers= or set PDF_WORKERS)
+PDF_WORKERS = int(os.environ.get('PDF_WORKERS', 1))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', 32))
+# Share of unreadable characters above which extracted text counts as garbled
+GARBLED_RATIO = 0.1
+
+_pdf_pool = None
+_pdf_pool_workers = 0
+_pdf_pool_lock = threading.Lock()
+# pdfium is not thread-safe: every call into it (open, pages, text, close) in this process is made
+# under this lock, since request and task threads extract PDFs at the same time
+_pdfium_lock = threading.Lock()
+
+# Function to turn a path, bytes or a binary stream into something pdfplumber or pdfium can open,
+# without writing anything to disk
+def open_pdf_source(source, max_bytes=MAX_PDF_BYTES):
+    if isinstance(source, (str, os.PathLike)):
+        if max_bytes is not None and os.path.getsize(source) > max_bytes:
+            raise PDFTooLargeError(f"PDF is larger than {max_bytes} bytes")
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+    else:
+        # A file-like object such as a Flask upload stream; read one byte past the limit to detect overflow
+        data = source.read() if max_bytes is None else source.read(max_bytes + 1)
+    if max_bytes is not None and len(data) > max_bytes:
+        raise PDFTooLargeError(f"PDF is larger than {max_bytes} bytes")
+    return io.BytesIO(data)
+
+# Function to yield the text of each page as it is extracted
+def iter_pdf_pages(source, max_pages=MAX_PDF_PAGES, max_bytes=MAX_PDF_BYTES):
+    with pdfplumber.open(open_pdf_source(source, max_bytes)) as pdf:
+        for page in pdf.pages[:max_pages]:
             page_text = page.extract_text()
+            # Drop the cached layout objects of a page once its text is out
+            page.close()
             if page_text:
-                text += page_text + '\n'
-    return text
+                yield page_text
+
+# Function to get the text of pages [start, stop) with pdfium; also run in the worker processes
+def pdfium_page_texts(source, start, stop):
+    raw_texts = []
+    with _pdfium_lock:
+        pdf = pypdfium2.PdfDocument(source)
+        try:
+            for index in range(start, stop):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                raw_texts.append(textpage.get_text_bounded())
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+    # Same shape as pdfplumber's text: \n line ends, no trailing blanks, no pdfium hyphen markers
+    texts = []
+    for text in raw_texts:
+        text = text.replace('\r\n', '\n').replace('\r', '\n').replace('\ufffe', '').replace('\x00', '')
+        texts.append('\n'.join(line.rstrip() for line in text.split('\n')).strip())
+    return texts
+
+def _get_pdf_pool(workers):
+    global _pdf_pool, _pdf_pool_workers
+    with _pdf_pool_lock:
+        if _pdf_pool_workers < workers:
+            if _pdf_pool is not None:
+                _pdf_pool.shutdown(wait=False)
+            # Spawned, not forked: the caller may be a threaded server process
+            _pdf_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pdf_pool_workers = workers
+    return _pdf_pool
+
+# Function to extract the page texts with pdfium, spreading long documents over the worker processes
+def extract_pages_pdfium(source, max_pages=MAX_PDF_PAGES, workers=None):
+    workers = PDF_WORKERS if workers is None else workers
+    if isinstance(source, io.BytesIO):
+        source = source.getvalue()
+    with _pdfium_lock:
+        pdf = pypdfium2.PdfDocument(source)
+        try:
+            page_count = len(pdf) if max_pages is None else min(len(pdf), max_pages)
+        finally:
+            pdf.close()
+
+    if workers <= 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+        return pdfium_page_texts(source, 0, page_count)
+
+    step = -(-page_count // workers)
+    futures = [_get_pdf_pool(workers).submit(pdfium_page_texts, source, start, min(start + step, page_count))
+               for start in range(0, page_count, step)]
+    return [text for future in futures for text in future.result()]
+
+# Function to tell whether extracted text is mostly unreadable (missing font maps, broken encodings)
+def looks_garbled(text, max_ratio=GARBLED_RATIO):
+    chars = [char for char in text if not char.isspace()]
+    if not chars:
+        return True
+    bad = sum(1 for char in chars if char == '\ufffd' or unicodedata.category(char) in ('Cc', 'Co', 'Cn', 'Cs'))
+    return bad / len(chars) > max_ratio
+
+# Step 1: Extract text
+def extract_text_from_pdf(source, max_pages=MAX_PDF_PAGES, max_bytes=MAX_PDF_BYTES, backend=None, workers=None):
+    backend = backend or PDF_BACKEND
+    if backend == 'pdfium' and pypdfium2 is not None:
+        source = open_pdf_source(source, max_bytes)
+        try:
+            pages = extract_pages_pdfium(source, max_pages, workers)
+        except pypdfium2.PdfiumError:
+            pages = []
+        text = ''.join(page_text + '\n' for page_text in pages if page_text)
+        if not looks_garbled(text):
+            return text
+        # Empty, unreadable or unopenable with pdfium: let pdfplumber have a go at the same document
+        if isinstance(source, io.BytesIO):
+            source.seek(0)
+        max_bytes = None
+    return ''.join(page_text + '\n' for page_text in iter_pdf_pages(source, max_pages, max_bytes))
 
 # Step 2: Remove summary section (heuristically)
 def remove_summary_sections(text):
@@ -110,16 +231,10 @@ def extract_resume_info(text):
     name = guess_name_from_text(lines)
 
     # Skills
-    found_skills = set()
-    for skill in skill_keywords:
-        if re.search(r'\b' + re.escape(skill.lower()) + r'\b', text_lower):
-            found_skills.add(skill)
+    found_skills = get_matcher(skill_keywords).find(text_lower)
 
     # Qualification
-    found_qualifications = set()
-    for qual in qualification_keywords:
-        if re.search(r'\b' + re.escape(qual.lower()) + r'\b', text_lower):
-            found_qualifications.add(qual)
+    found_qualifications = get_matcher(qualification_keywords).find(text_lower)
 
     # Experience (only from date ranges)
     experience = calculate_experience_from_ranges(text)
@@ -0,0 +1,49 @@
+import copy
+import hashlib
+import os
+
+import resume_extract
+import job_role_prediction
+import metrics
+from cache import make_cache
+
+# Parsed resumes and their predicted roles, keyed by a hash of the PDF bytes, so a resubmitted
+# resume skips straight to the job search. Set RESUME_CACHE_PATH to keep them in an SQLite file
+RESUME_CACHE_PATH = os.environ.get("RESUME_CACHE_PATH")
+RESUME_CACHE_SIZE = int(os.environ.get("RESUME_CACHE_SIZE", 1024))
+RESUME_CACHE_TTL = int(os.environ.get("RESUME_CACHE_TTL", 24 * 60 * 60))
+resume_cache = make_cache(RESUME_CACHE_PATH, maxsize=RESUME_CACHE_SIZE, ttl=RESUME_CACHE_TTL, table="resume_cache")
+metrics.register_cache("resume", resume_cache)
+
+
+def resume_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+# Function to read an upload stream into memory, refusing anything above max_bytes
+def read_pdf_bytes(stream, max_bytes=resume_extract.MAX_PDF_BYTES):
+    data = stream.read() if max_bytes is None else stream.read(max_bytes + 1)
+    if max_bytes is not None and len(data) > max_bytes:
+        raise resume_extract.PDFTooLargeError(f"PDF is larger than {max_bytes} bytes")
+    return data
+
+
+# Function to extract the resume info and predict the top roles of a PDF, reusing earlier results
+# for the same bytes. Returns {'info': ..., 'job_roles': [(role, probability), ...]}, a copy the caller
+# may change: the in-memory cache hands out the stored object itself
+def analyze_resume(data, top_k=3, max_pages=resume_extract.MAX_PDF_PAGES):
+    key = (resume_hash(data), top_k, max_pages)
+    cached = resume_cache.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    with metrics.stage("pdf_text"):
+        text = resume_extract.extract_text_from_pdf(data, max_pages=max_pages, max_bytes=None)
+    with metrics.stage("resume_keywords"):
+        info = resume_extract.extract_resume_info(text)
+    with metrics.stage("predict"):
+        job_roles = job_role_prediction.predict_top_job_roles(info['Skills'], info['Experience'], info['Qualification'], k=top_k)
+
+    result = {'info': info, 'job_roles': job_roles}
+    resume_cache.set(key, result)
+    return copy.deepcopy(result)
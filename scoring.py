@@ -0,0 +1,123 @@
+import os
+import re
+
+import numpy as np
+
+from keyword_matcher import SKILL_KEYWORDS
+
+# Shared skill vocabulary: every posting and user skill list is encoded as a row over these columns
+VOCABULARY = list(dict.fromkeys(SKILL_KEYWORDS))
+VOCABULARY_INDEX = {skill: i for i, skill in enumerate(VOCABULARY)}
+
+# Weights of the ranking features. With only "overlap" the ranking is the plain skill match count;
+# "jaccard" rewards postings asking for few skills beyond the user's, "idf" rewards rare skills
+# and "recency" favours recently posted jobs. Override with e.g. SCORE_WEIGHTS="overlap=1,recency=2"
+DEFAULT_WEIGHTS = {"overlap": 1.0, "jaccard": 0.0, "idf": 0.0, "recency": 0.0}
+RECENCY_HALF_LIFE_DAYS = float(os.environ.get("SCORE_RECENCY_HALF_LIFE_DAYS", 7))
+
+
+# Function to parse "name=value,name=value" weights; unknown names are rejected
+def parse_weights(text):
+    weights = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, _, value = item.partition("=")
+        name = name.strip().lower()
+        if name not in DEFAULT_WEIGHTS:
+            raise ValueError(f"Unknown score weight: {name}")
+        weights[name] = float(value)
+    return weights
+
+
+SCORE_WEIGHTS = dict(DEFAULT_WEIGHTS, **parse_weights(os.environ.get("SCORE_WEIGHTS", "")))
+
+_AGE_UNITS = {"minute": 1 / 1440, "hour": 1 / 24, "day": 1, "week": 7, "month": 30, "year": 365}
+_AGE_PATTERN = re.compile(r"(\d+)\+?\s*(minute|hour|day|week|month|year)", re.IGNORECASE)
+
+
+# Function to encode lists of skills as a boolean matrix over the vocabulary (unknown skills are ignored)
+def encode(skill_lists, vocabulary_index=VOCABULARY_INDEX):
+    skill_lists = [skills or () for skills in skill_lists]
+    matrix = np.zeros((len(skill_lists), len(vocabulary_index)), dtype=bool)
+    columns = np.fromiter((vocabulary_index.get(skill, -1) for skills in skill_lists for skill in skills), dtype=np.intp)
+    rows = np.repeat(np.arange(len(skill_lists)), [len(skills) for skills in skill_lists])
+    known = columns >= 0
+    matrix[rows[known], columns[known]] = True
+    return matrix
+
+
+# Function to turn LinkedIn's "Time Posted" text ("3 days ago", "1 week ago") into an age in days
+def posted_age_days(time_posted):
+    match = _AGE_PATTERN.search(str(time_posted or ""))
+    if not match:
+        return None
+    return int(match.group(1)) * _AGE_UNITS[match.group(2).lower()]
+
+
+# Function to compute every ranking feature and the weighted score of all postings at once
+def score_postings(postings, user_skills, weights=None):
+    weights = dict(SCORE_WEIGHTS, **(weights or {}))
+    n = len(postings)
+
+    posting_matrix = encode([posting.get("Skills") for posting in postings])
+    user_vector = encode([user_skills])[0]
+
+    # Overlap of every posting with the user in a single matrix-vector product
+    overlap = posting_matrix.astype(np.float64) @ user_vector.astype(np.float64)
+    features = {"overlap": overlap}
+    score = weights["overlap"] * overlap
+
+    if weights["jaccard"]:
+        union = posting_matrix.sum(axis=1) + user_vector.sum() - overlap
+        features["jaccard"] = np.divide(overlap, union, out=np.zeros(n), where=union > 0)
+        score = score + weights["jaccard"] * features["jaccard"]
+
+    if weights["idf"]:
+        # Skill rarity among the candidate postings
+        document_frequency = posting_matrix.sum(axis=0)
+        idf = np.log((n + 1) / (document_frequency + 1)) + 1
+        features["idf"] = posting_matrix.astype(np.float64) @ (idf * user_vector)
+        score = score + weights["idf"] * features["idf"]
+
+    if weights["recency"]:
+        ages = np.array([posted_age_days(posting.get("Time Posted")) for posting in postings], dtype=np.float64)
+        # Postings without a parsable age get no recency credit
+        features["recency"] = np.where(np.isnan(ages), 0.0, 0.5 ** (np.nan_to_num(ages) / RECENCY_HALF_LIFE_DAYS))
+        score = score + weights["recency"] * features["recency"]
+
+    # Weight by the probability of the role a posting was found for, when it has one
+    role_probability = np.array([posting.get("Role Probability", 1.0) for posting in postings], dtype=np.float64)
+    features["score"] = score * role_probability
+    return features
+
+
+# Function to pick the indices of the k best scores, best first. Ties go to the higher tiebreak
+# value, then to the earlier posting, so the result is deterministic
+def top_k(scores, k, mask=None, tiebreak=None):
+    candidates = np.arange(len(scores)) if mask is None else np.flatnonzero(mask)
+    if k <= 0 or len(candidates) == 0:
+        return []
+    candidate_scores = scores[candidates]
+    if len(candidates) > k:
+        # argpartition finds the k best in linear time; keep every posting tied with the k-th so
+        # the final ordering below can apply the tie-breaks
+        kth = np.partition(-candidate_scores, k - 1)[k - 1]
+        candidates = candidates[-candidate_scores <= kth]
+        candidate_scores = scores[candidates]
+    secondary = np.zeros(len(candidates)) if tiebreak is None else tiebreak[candidates]
+    order = np.lexsort((candidates, -secondary, -candidate_scores))
+    return candidates[order][:k].tolist()
+
+
+# Function to rank postings for a user: keeps those passing the qualification filter and returns
+# the top n as (position, posting) pairs, with each posting's "Score" set to its weighted score
+def rank_postings(postings, user_skills, n=4, weights=None):
+    if not postings:
+        return []
+    features = score_postings(postings, user_skills, weights)
+    qualified = np.array([posting.get("Qualification Match") == 1 for posting in postings])
+    skill_match = np.array([posting.get("Skill Match", 0) for posting in postings], dtype=np.float64)
+    ranked = []
+    for index in top_k(features["score"], n, mask=qualified, tiebreak=skill_match):
+        postings[index]["Score"] = float(features["score"][index])
+        ranked.append((index, postings[index]))
+    return ranked
@@ -0,0 +1,164 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFullError(Exception):
+    pass
+
+
+# A unit of background work; the task function gets it as first argument to report progress
+class Task:
+    def __init__(self, task_id, on_change=None):
+        self.id = task_id
+        self.on_change = on_change
+        self.state = 'queued'
+        self.progress = 0.0
+        self.message = 'Queued'
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+
+    def update(self, progress, message=None):
+        self.progress = progress
+        if message is not None:
+            self.message = message
+        if self.on_change is not None:
+            self.on_change(self)
+
+    def status(self):
+        return {
+            'id': self.id,
+            'state': self.state,
+            'progress': self.progress,
+            'message': self.message,
+            'error': self.error,
+        }
+
+
+# Task queue: a bounded pool of worker threads, a limit on queued + running tasks and finished
+# results kept for result_ttl seconds. Tasks run in the process that queued them; with a path,
+# their state and results are also written to SQLite so that every server process can answer
+# /status and /result. The max_queued limit applies per process
+class TaskQueue:
+    def __init__(self, workers=4, max_queued=64, result_ttl=600, path=None):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.result_ttl = result_ttl
+        self.path = path
+        self.tasks = {}
+        self.lock = threading.Lock()
+        # Threads are only started on the first submit, so creating the queue before forking is safe
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='task')
+        # Same for the database: each process opens its own connection on first use
+        self.conn = None
+        self.conn_pid = None
+        self.db_lock = threading.Lock()
+
+    def _connection(self):
+        if self.conn is None or self.conn_pid != os.getpid():
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn_pid = os.getpid()
+            with self.conn:
+                self.conn.execute("PRAGMA journal_mode=WAL")
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS tasks (id TEXT PRIMARY KEY, state TEXT, progress REAL, "
+                    "message TEXT, error TEXT, result BLOB, created REAL, finished REAL)"
+                )
+        return self.conn
+
+    # Function to write a task's state (and its result once done) for the other processes
+    def _save(self, task):
+        if self.path is None:
+            return
+        result = pickle.dumps(task.result, pickle.HIGHEST_PROTOCOL) if task.state == 'done' else None
+        with self.db_lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO tasks (id, state, progress, message, error, result, created, finished) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (task.id, task.state, task.progress, task.message, task.error, result, task.created,
+                     task.finished),
+                )
+                conn.execute("DELETE FROM tasks WHERE finished IS NOT NULL AND finished < ?",
+                             (time.time() - self.result_ttl,))
+
+    # Function to read a task queued by another process, or None
+    def _load(self, task_id):
+        if self.path is None:
+            return None
+        with self.db_lock:
+            row = self._connection().execute(
+                "SELECT state, progress, message, error, result, created, finished FROM tasks "
+                "WHERE id = ? AND (finished IS NULL OR finished >= ?)",
+                (task_id, time.time() - self.result_ttl),
+            ).fetchone()
+        if row is None:
+            return None
+        task = Task(task_id)
+        task.state, task.progress, task.message, task.error, result, task.created, task.finished = row
+        task.result = pickle.loads(result) if result is not None else None
+        return task
+
+    def _active(self):
+        return sum(1 for task in self.tasks.values() if task.state in ('queued', 'running'))
+
+    # Drop finished tasks whose results have been kept longer than result_ttl
+    def _expire(self):
+        now = time.time()
+        for task_id in [task.id for task in self.tasks.values()
+                        if task.finished is not None and now - task.finished > self.result_ttl]:
+            del self.tasks[task_id]
+
+    def _run(self, task, func, args, kwargs):
+        task.state = 'running'
+        task.message = 'Running'
+        self._save(task)
+        try:
+            result = func(task, *args, **kwargs)
+        except Exception as e:
+            task.error = str(e) or e.__class__.__name__
+            task.state = 'failed'
+            task.message = 'Failed'
+        else:
+            task.result = result
+            task.state = 'done'
+            task.progress = 1.0
+            task.message = 'Done'
+        task.finished = time.time()
+        self._save(task)
+
+    # Queue func(task, *args, **kwargs) and return the task id, or raise QueueFullError
+    def submit(self, func, *args, **kwargs):
+        with self.lock:
+            self._expire()
+            if self._active() >= self.max_queued:
+                raise QueueFullError('Too many tasks in the queue')
+            task = Task(uuid.uuid4().hex, on_change=self._save)
+            self.tasks[task.id] = task
+        self._save(task)
+        self.executor.submit(self._run, task, func, args, kwargs)
+        return task.id
+
+    def get(self, task_id):
+        with self.lock:
+            self._expire()
+            task = self.tasks.get(task_id)
+        return task if task is not None else self._load(task_id)
+
+    def status(self, task_id):
+        task = self.get(task_id)
+        return task.status() if task else None
+
+    def stats(self):
+        with self.lock:
+            states = {}
+            for task in self.tasks.values():
+                states[task.state] = states.get(task.state, 0) + 1
+            return {'workers': self.workers, 'max_queued': self.max_queued, 'tasks': states}
@@ -0,0 +1,107 @@
+import pytest
+
+import cache
+from cache import SQLiteCache, TTLCache, make_cache
+
+
+# Stands in for the time module so expiry and recency do not depend on the wall clock
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make(request, tmp_path):
+    def make(**kwargs):
+        if request.param == "sqlite":
+            return SQLiteCache(str(tmp_path / "cache.db"), **kwargs)
+        return TTLCache(**kwargs)
+    return make
+
+
+def test_get_and_set(make, clock):
+    c = make()
+    assert c.get("a") is None
+    assert c.get("a", "default") == "default"
+    c.set("a", 1)
+    assert c.get("a") == 1
+    assert c.stats() == {"size": 1, "hits": 1, "misses": 2, "hit_ratio": 1 / 3}
+
+
+def test_entries_expire_after_ttl(make, clock):
+    c = make(ttl=10)
+    c.set("a", 1)
+    clock.advance(9)
+    assert c.get("a") == 1
+    clock.advance(1)
+    assert c.get("a") is None
+    assert len(c) == 0
+
+
+def test_no_ttl_never_expires(make, clock):
+    c = make(ttl=0)
+    c.set("a", 1)
+    clock.advance(10 ** 9)
+    assert c.get("a") == 1
+
+
+def test_least_recently_used_is_evicted(make, clock):
+    c = make(maxsize=2)
+    c.set("a", 1)
+    clock.advance(1)
+    c.set("b", 2)
+    clock.advance(1)
+    assert c.get("a") == 1
+    clock.advance(1)
+    c.set("c", 3)
+    assert len(c) == 2
+    assert c.get("b") is None
+    assert c.get("a") == 1
+    assert c.get("c") == 3
+
+
+def test_overwrite_delete_and_clear(make, clock):
+    c = make()
+    c.set("a", 1)
+    c.set("a", 2)
+    assert c.get("a") == 2
+    assert len(c) == 1
+    c.delete("a")
+    c.delete("missing")
+    assert c.get("a") is None
+    c.set("b", 1)
+    c.clear()
+    assert len(c) == 0
+
+
+def test_sqlite_round_trip(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    value = {"info": {"Skills": ["Python"], "Experience": 2.5}, "job_roles": [("Data Scientist", 0.7)]}
+    SQLiteCache(path, table="resume_cache").set(("hash", 3, None), value)
+
+    # Another instance (another worker, or the next run) reads the same file
+    other = SQLiteCache(path, table="resume_cache")
+    assert other.get(("hash", 3, None)) == value
+    assert other.get(("hash", 5, None)) is None
+    assert SQLiteCache(path, table="other").get(("hash", 3, None)) is None
+
+
+def test_make_cache(tmp_path):
+    assert isinstance(make_cache(), TTLCache)
+    assert isinstance(make_cache(str(tmp_path / "cache.db")), SQLiteCache)
@@ -0,0 +1,181 @@
+import sqlite3
+import sys
+import threading
+import time
+
+import pytest
+
+from job_store import JobStore
+
+ROLES = [("Data Scientist", 0.7), ("Software Engineer", 0.3)]
+
+
+def posting(job_id, skills, qualifications=("BTech",), title="Engineer"):
+    return {"Job ID": job_id, "Job Title": title, "Company Name": "Acme", "Location": "Pune",
+            "Skills": list(skills), "Qualifications": list(qualifications)}
+
+
+# Two stores on one file, like the refresher and a server worker
+@pytest.fixture
+def stores(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    writer, reader = JobStore(path), JobStore(path)
+    yield writer, reader
+    writer.close()
+    reader.close()
+
+
+def search_ids(store, **kwargs):
+    return [match["Job ID"] for match in store.search(["Python", "SQL"], ["BTech"], **kwargs)]
+
+
+def test_reader_sees_postings_added_by_another_instance(stores):
+    writer, reader = stores
+    assert len(reader) == 0
+    assert not reader.is_fresh(ROLES, "Pune", min_postings=2)
+
+    writer.add_postings([posting("1", ["Python"]), posting("2", ["Python", "SQL"])], role="Data Scientist",
+                        location="Pune")
+    assert len(reader) == 2
+    assert reader.is_fresh(ROLES, "pune ", min_postings=2)
+    assert not reader.is_fresh(ROLES, "Mumbai", min_postings=1)
+    assert search_ids(reader, roles=ROLES, location="Pune") == ["2", "1"]
+
+
+def test_reader_sees_refreshed_postings(stores):
+    writer, reader = stores
+    writer.add_postings([posting("1", ["Java"])], role="Data Scientist", location="Pune")
+    assert search_ids(reader) == []
+
+    writer.add_postings([posting("1", ["Python", "SQL"])], role="Data Scientist", location="Pune")
+    assert search_ids(reader) == ["1"]
+    assert reader.get("1")["Skills"] == ["Python", "SQL"]
+    assert reader.stats()["skills"] == 2
+
+
+def test_reader_sees_expired_postings_removed(stores):
+    writer, reader = stores
+    writer.add_postings([posting("old", ["Python"])], role="Data Scientist", location="Pune",
+                        fetched_at=time.time() - 3600)
+    writer.add_postings([posting("new", ["Python"])], role="Data Scientist", location="Pune")
+    assert len(reader) == 2
+
+    assert writer.expire(600) == 1
+    assert len(reader) == 1
+    assert not reader.has("old")
+    assert search_ids(reader, roles=ROLES, location="Pune") == ["new"]
+
+
+def test_old_searches_are_not_fresh(stores):
+    writer, reader = stores
+    writer.add_postings([posting("1", ["Python"])], role="Data Scientist", location="Pune",
+                        fetched_at=time.time() - 3600)
+    assert not reader.is_fresh(ROLES, "Pune", max_age=600, min_postings=1)
+    writer.record_search("Data Scientist", "Pune", ["1", "unknown"])
+    assert reader.is_fresh(ROLES, "Pune", max_age=600, min_postings=1)
+    assert reader.search_job_ids("Data Scientist", "Pune", max_age=600) == {"1"}
+
+
+def test_search_filters_qualifications_and_weights_roles(stores):
+    writer, reader = stores
+    writer.add_postings([posting("ds", ["Python"])], role="Data Scientist", location="Pune")
+    writer.add_postings([posting("se", ["Python"])], role="Software Engineer", location="Pune")
+    writer.add_postings([posting("phd", ["Python", "SQL"], qualifications=["PHD"])], role="Data Scientist",
+                        location="Pune")
+    writer.add_postings([posting("any", ["SQL"], qualifications=[])], role="Software Engineer", location="Pune")
+
+    matches = reader.search(["Python", "SQL"], ["BTech"], roles=ROLES, location="Pune")
+    assert [(match["Job ID"], match["Role"]) for match in matches] == [
+        ("ds", "Data Scientist"), ("any", "Software Engineer"), ("se", "Software Engineer")]
+    assert reader.search(["Python"], [], roles=ROLES, location="Pune") == []
+
+
+def test_search_ties_have_a_fixed_order(stores):
+    writer, reader = stores
+    job_ids = [str(job_id) for job_id in range(20)]
+    writer.add_postings([posting(job_id, ["Python"]) for job_id in job_ids], role="Data Scientist", location="Pune")
+    assert search_ids(reader, n=20) == sorted(job_ids)
+    assert search_ids(reader, roles=ROLES, location="Pune", n=20) == sorted(job_ids)
+
+
+def test_reopened_store_loads_everything(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = JobStore(path)
+    store.add_postings([posting("1", ["Python"]), posting("2", ["SQL"])], role="Data Scientist", location="Pune")
+    store.close()
+
+    store = JobStore(path)
+    assert len(store) == 2
+    assert store.search_job_ids("data scientist", "Pune") == {"1", "2"}
+    assert store.stats() == {"postings": 2, "skills": 2, "qualifications": 1, "searches": 1}
+    store.close()
+
+
+# The in-app refresher writes to the same store the request threads read
+def test_reads_while_another_thread_writes(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    # Dated ahead so the writer's expire() leaves them and the dicts stay large
+    store.add_postings([posting(str(job_id), ["Python"]) for job_id in range(2000)], role="Data Scientist",
+                       location="Pune", fetched_at=time.time() + 3600)
+    stop = threading.Event()
+    # Switch threads often so a read is interrupted halfway through the dicts
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    def write():
+        batch = 0
+        while not stop.is_set():
+            batch += 1
+            job_ids = [f"{batch}-{job_id}" for job_id in range(20)]
+            store.add_postings([posting(job_id, ["Python"]) for job_id in job_ids], role="Data Scientist",
+                               location="Pune")
+            store.record_search("Data Scientist", "Pune", job_ids)
+            store.expire(0.05)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        deadline = time.time() + 1
+        while time.time() < deadline:
+            store.is_fresh(ROLES, "Pune", min_postings=1)
+            store.search_job_ids("Data Scientist", "Pune")
+    finally:
+        sys.setswitchinterval(switch_interval)
+        stop.set()
+        writer.join()
+        store.close()
+
+
+def test_reader_sees_rows_with_older_timestamps(stores):
+    writer, reader = stores
+    writer.add_postings([posting("1", ["Java"])], role="Data Scientist", location="Pune")
+    assert len(reader) == 1
+
+    # Committed later but dated earlier, like a slow writer or an explicit fetched_at
+    writer.add_postings([posting("1", ["Python"])], role="Data Scientist", location="Pune",
+                        fetched_at=time.time() - 60)
+    assert search_ids(reader) == ["1"]
+    writer.record_search("Software Engineer", "Pune", ["1"], fetched_at=time.time() - 60)
+    assert reader.is_fresh([("Software Engineer", 1.0)], "Pune", min_postings=1)
+
+
+def test_opens_stores_without_write_sequence(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("CREATE TABLE postings (job_id TEXT PRIMARY KEY, title TEXT, company TEXT, location TEXT, "
+                     "time_posted TEXT, applicants TEXT, apply_link TEXT, skills TEXT, qualifications TEXT, "
+                     "fetched_at REAL)")
+        conn.execute("CREATE TABLE search_results (role TEXT, location TEXT, job_id TEXT, fetched_at REAL, "
+                     "PRIMARY KEY (role, location, job_id)) WITHOUT ROWID")
+        conn.execute("INSERT INTO postings (job_id, skills, qualifications, fetched_at) VALUES ('1', '[\"Python\"]', "
+                     "'[]', ?)", (time.time(),))
+        conn.execute("INSERT INTO search_results VALUES ('data scientist', 'pune', '1', ?)", (time.time(),))
+    conn.close()
+
+    writer, reader = JobStore(path), JobStore(path)
+    assert reader.search_job_ids("Data Scientist", "Pune") == {"1"}
+    writer.add_postings([posting("2", ["SQL"])], role="Data Scientist", location="Pune")
+    assert len(reader) == 2
+    writer.close()
+    reader.close()
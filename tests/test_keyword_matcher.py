@@ -0,0 +1,87 @@
+import random
+import re
+
+import pytest
+
+from keyword_matcher import QUALIFICATION_KEYWORDS, SKILL_KEYWORDS, KeywordMatcher, get_matcher
+
+TEXTS = [
+    "Experienced in Python, Go and C++ with some C# and Node.js; CI/CD with Jenkins.",
+    "Post Graduate in Computer Science (M.Sc), Bachelor of Engineering",
+    "Good golang skills. Gopher. Javascript, java-script, JAVA and java8",
+    "Machine learning, deep-learning, scikit-learn, Front-end and back-end work",
+    "",
+    "c++c++ c#c# (C++) [Go] Spark/Hadoop REST APIs REST API",
+]
+
+
+# The per-keyword search the matcher replaces, with the matcher's word boundaries: a keyword may not
+# touch a word character on either side (unlike \b, this also lets "C++" match before a space)
+def naive_find(keywords, text):
+    return {keyword for keyword in dict.fromkeys(keywords)
+            if re.search(r"(?<!\w)" + re.escape(keyword) + r"(?!\w)", text, re.IGNORECASE)}
+
+
+def random_texts(keywords, count=300, seed=0):
+    rng = random.Random(seed)
+    pieces = list(keywords) + [keyword.upper() for keyword in keywords] + ["and", "the", "x", "_", "go-to"]
+    separators = [" ", ", ", "/", "-", "", "\n", "_", ".", "(", ")"]
+    return ["".join(rng.choice(pieces) + rng.choice(separators) for _ in range(rng.randint(1, 12)))
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize("keywords", [SKILL_KEYWORDS, QUALIFICATION_KEYWORDS], ids=["skills", "qualifications"])
+def test_matches_naive_search(keywords):
+    matcher = KeywordMatcher(keywords)
+    for text in TEXTS + random_texts(keywords):
+        assert matcher.find(text) == naive_find(keywords, text), text
+
+
+def test_same_as_word_boundaries_for_word_keywords():
+    keywords = [keyword for keyword in SKILL_KEYWORDS if re.match(r"\w", keyword) and re.search(r"\w$", keyword)]
+    matcher = KeywordMatcher(keywords)
+    for text in TEXTS + random_texts(keywords, seed=1):
+        expected = {keyword for keyword in keywords
+                    if re.search(r"\b" + re.escape(keyword.lower()) + r"\b", text.lower())}
+        assert matcher.find(text) == expected, text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("C++ and C# developer", {"C", "C++", "C#"}),
+    ("Skills: C#, C++.", {"C", "C++", "C#"}),
+    ("c++", {"C", "C++"}),
+    (".NET and ASP.NET", {".NET"}),
+    ("C++11 and C#9", {"C"}),
+    ("ObjectiveC++ X.NET", set()),
+])
+def test_keywords_ending_in_symbols(text, expected):
+    keywords = ["C", "C++", "C#", ".NET"]
+    assert KeywordMatcher(keywords).find(text) == expected
+    assert naive_find(keywords, text) == expected
+
+
+def test_word_boundaries_would_miss_symbol_endings():
+    # What the lookarounds fix: \b after a symbol needs a word character next
+    assert not re.search(r"\bc\+\+\b", "c++ developer")
+    assert KeywordMatcher(SKILL_KEYWORDS).find("C++ developer") == {"C++"}
+
+
+def test_overlapping_and_prefix_keywords():
+    matcher = KeywordMatcher(["Post Graduate", "Graduate", "C", "C++", "Go", "Golang"])
+    assert matcher.find("post graduate") == {"Post Graduate", "Graduate"}
+    assert matcher.find("C++ developer") == {"C", "C++"}
+    assert matcher.find("golang") == {"Golang"}
+    assert matcher.find("good going") == set()
+
+
+def test_returns_keywords_as_written():
+    assert get_matcher(SKILL_KEYWORDS).find("PYTHON and pytorch") == {"Python", "PyTorch"}
+
+
+def test_find_all_is_the_union():
+    matcher = get_matcher(SKILL_KEYWORDS)
+    assert matcher.find_all(TEXTS) == set().union(*(matcher.find(text) for text in TEXTS))
+
+
+def test_get_matcher_is_cached():
+    assert get_matcher(SKILL_KEYWORDS) is get_matcher(list(SKILL_KEYWORDS))
@@ -0,0 +1,74 @@
+import logging
+import threading
+
+import pytest
+
+import linkdin_jobs
+import metrics
+import refresher
+from job_store import JobStore
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    monkeypatch.setattr(metrics, "MULTIPROC_DIR", None)
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    yield store
+    store.close()
+
+
+def make_refresher(store, **kwargs):
+    return refresher.Refresher(store, locations=["Pune"], roles=["Data Scientist"], rate=1000, pages=2, **kwargs)
+
+
+def test_failed_searches_and_postings_are_counted(monkeypatch, store, counted, caplog):
+    def search_job_links(role, location, start=0):
+        if start:
+            raise ConnectionError("search down")
+        return {"1": "https://example.com/1", "2": "https://example.com/2"}
+
+    def parse_job_posting(job_id):
+        if job_id == "2":
+            raise ValueError("bad posting")
+        return {"Job Title": "Data Scientist", "Skills": ["Python"], "Qualifications": []}
+
+    monkeypatch.setattr(linkdin_jobs, "search_job_links", search_job_links)
+    monkeypatch.setattr(linkdin_jobs, "parse_job_posting", parse_job_posting)
+    with caplog.at_level(logging.WARNING, logger="refresher"):
+        result = make_refresher(store).run_once()
+
+    assert result["new_postings"] == 1
+    assert result["errors"] == 2
+    assert store.has("1")
+    text = metrics.render()
+    assert 'errors_total{stage="refresh_search"} 1' in text
+    assert 'errors_total{stage="refresh_posting"} 1' in text
+    assert "search down" in caplog.text and "bad posting" in caplog.text
+
+
+def test_failed_cycles_are_logged_and_the_loop_goes_on(monkeypatch, store, counted, caplog):
+    r = make_refresher(store, interval=0.01)
+    cycles = threading.Semaphore(0)
+
+    def run_once():
+        cycles.release()
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(r, "run_once", run_once)
+    with caplog.at_level(logging.ERROR, logger="refresher"):
+        r.start()
+        try:
+            assert cycles.acquire(timeout=5) and cycles.acquire(timeout=5)
+        finally:
+            r.stop(timeout=5)
+
+    assert "database is locked" in caplog.text
+    assert 'errors_total{stage="refresh"}' in metrics.render()
@@ -0,0 +1,62 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import resume_extract
+from benchmarks.pdf_fixtures import synthetic_resume
+
+pytest.importorskip("pypdfium2")
+
+
+def test_pdfium_text_matches_pdfplumber():
+    data = synthetic_resume(3, seed=1)
+    pdfium = resume_extract.extract_text_from_pdf(data, backend="pdfium")
+    assert pdfium
+    assert pdfium == resume_extract.extract_text_from_pdf(data, backend="pdfplumber")
+
+
+def test_concurrent_extraction_matches_serial():
+    documents = [synthetic_resume(20, seed=seed) for seed in range(4)]
+    expected = [resume_extract.extract_text_from_pdf(data, backend="pdfium") for data in documents]
+
+    # Request threads and task threads extract at the same time in the server
+    jobs = [index % len(documents) for index in range(8 * 15)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        texts = list(pool.map(lambda index: resume_extract.extract_text_from_pdf(documents[index], backend="pdfium"),
+                              jobs))
+    assert texts == [expected[index] for index in jobs]
+
+
+def test_pdfium_is_never_entered_by_two_threads(monkeypatch):
+    document_class = resume_extract.pypdfium2.PdfDocument
+    lock = threading.Lock()
+    open_documents = []
+    most_open = []
+
+    # Counts the documents open at once; the sleep widens the window for an unserialized caller
+    class CountingDocument(document_class):
+        def __init__(self, *args, **kwargs):
+            with lock:
+                open_documents.append(self)
+                most_open.append(len(open_documents))
+            time.sleep(0.01)
+            super().__init__(*args, **kwargs)
+
+        def close(self):
+            with lock:
+                open_documents.remove(self)
+            super().close()
+
+    monkeypatch.setattr(resume_extract.pypdfium2, "PdfDocument", CountingDocument)
+    data = synthetic_resume(2, seed=3)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        texts = list(pool.map(lambda _: resume_extract.extract_text_from_pdf(data, backend="pdfium"), range(32)))
+    assert len(set(texts)) == 1
+    assert max(most_open) == 1
+
+
+def test_max_pages_limits_pdfium_pages():
+    data = synthetic_resume(5, seed=2)
+    assert resume_extract.extract_pages_pdfium(data, max_pages=2) == resume_extract.extract_pages_pdfium(data)[:2]
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+import scoring
+from scoring import encode, parse_weights, posted_age_days, rank_postings, score_postings, top_k
+
+
+# The order top_k promises: best score, then higher tiebreak, then the earlier index
+def sorted_top_k(scores, k, mask=None, tiebreak=None):
+    candidates = [i for i in range(len(scores)) if mask is None or mask[i]]
+    secondary = np.zeros(len(scores)) if tiebreak is None else tiebreak
+    return sorted(candidates, key=lambda i: (-scores[i], -secondary[i], i))[:max(k, 0)]
+
+
+def test_top_k_orders_best_first():
+    scores = np.array([0.5, 3.0, 1.0, 2.0])
+    assert top_k(scores, 2) == [1, 3]
+    assert top_k(scores, 10) == [1, 3, 2, 0]
+
+
+def test_top_k_ties_go_to_tiebreak_then_earlier_index():
+    scores = np.array([1.0, 2.0, 2.0, 2.0, 1.0])
+    assert top_k(scores, 2) == [1, 2]
+    assert top_k(scores, 2, tiebreak=np.array([0, 1, 5, 5, 9])) == [2, 3]
+    # Ties straddling the k-th place are all kept until the final ordering
+    assert top_k(scores, 4, tiebreak=np.array([0, 0, 0, 0, 9])) == [1, 2, 3, 4]
+
+
+def test_top_k_mask_and_empty():
+    scores = np.array([3.0, 2.0, 1.0])
+    assert top_k(scores, 2, mask=np.array([False, True, True])) == [1, 2]
+    assert top_k(scores, 2, mask=np.zeros(3, dtype=bool)) == []
+    assert top_k(scores, 0) == []
+    assert top_k(np.array([]), 3) == []
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_top_k_matches_full_sort(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 60))
+    # Few distinct values, so there are many ties
+    scores = rng.integers(0, 4, n).astype(np.float64)
+    tiebreak = rng.integers(0, 3, n).astype(np.float64)
+    mask = rng.random(n) < 0.7
+    for k in (1, 3, n):
+        assert top_k(scores, k) == sorted_top_k(scores, k)
+        assert top_k(scores, k, mask=mask, tiebreak=tiebreak) == sorted_top_k(scores, k, mask, tiebreak)
+
+
+def test_encode_ignores_unknown_skills():
+    matrix = encode([["Python", "Cobol"], None, ["SQL", "Python"]])
+    assert matrix.shape == (3, len(scoring.VOCABULARY))
+    assert matrix.sum(axis=1).tolist() == [1, 0, 2]
+    assert matrix[0, scoring.VOCABULARY_INDEX["Python"]]
+
+
+def test_overlap_is_skill_match_count():
+    postings = [{"Skills": ["Python", "SQL", "Docker"]}, {"Skills": ["Java"]}, {"Skills": []}]
+    features = score_postings(postings, ["Python", "Docker", "Java"], weights=dict(scoring.DEFAULT_WEIGHTS))
+    assert features["overlap"].tolist() == [2, 1, 0]
+    assert features["score"].tolist() == [2, 1, 0]
+
+
+def test_role_probability_scales_score():
+    postings = [{"Skills": ["Python"], "Role Probability": 0.25}, {"Skills": ["Python"]}]
+    features = score_postings(postings, ["Python"], weights=dict(scoring.DEFAULT_WEIGHTS))
+    assert features["score"].tolist() == [0.25, 1.0]
+
+
+def test_posted_age_days():
+    assert posted_age_days("3 days ago") == 3
+    assert posted_age_days("1 week ago") == 7
+    assert posted_age_days("12 hours ago") == 0.5
+    assert posted_age_days("") is None
+    assert posted_age_days(None) is None
+
+
+def test_parse_weights():
+    assert parse_weights("overlap=1, recency=2") == {"overlap": 1.0, "recency": 2.0}
+    assert parse_weights("") == {}
+    with pytest.raises(ValueError):
+        parse_weights("salary=1")
+
+
+def test_rank_postings_filters_unqualified_and_sets_score():
+    postings = [
+        {"Skills": ["Python", "SQL"], "Qualification Match": 1, "Skill Match": 2},
+        {"Skills": ["Python", "SQL", "Docker"], "Qualification Match": 0, "Skill Match": 3},
+        {"Skills": ["Python"], "Qualification Match": 1, "Skill Match": 1},
+        {"Skills": ["SQL"], "Qualification Match": 1, "Skill Match": 1},
+    ]
+    ranked = rank_postings(postings, ["Python", "SQL", "Docker"], n=2, weights=dict(scoring.DEFAULT_WEIGHTS))
+    assert [index for index, _ in ranked] == [0, 2]
+    assert ranked[0][1] is postings[0] and postings[0]["Score"] == 2.0
+    assert "Score" not in postings[1]
+    assert rank_postings([], ["Python"]) == []
@@ -0,0 +1,215 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import platform
+import re
+import sys
+import time
+
+import joblib
+import numpy as np
+import sklearn
+from scipy import sparse
+from sklearn.model_selection import GridSearchCV, cross_val_score
+from sklearn.preprocessing import LabelEncoder, MultiLabelBinarizer
+from sklearn.svm import SVC
+
+import model_registry
+from job_role_prediction import (DEGREE_LABELS, DOMAIN_LABELS, NUMERIC_FEATURES, convert_experience, extract_degree,
+                                 extract_domain)
+
+# Accepted column names (or JSON keys) of each field, compared case-insensitively
+FIELD_NAMES = {
+    "skills": ("skills", "skill"),
+    "experience": ("experience", "experience_years", "years"),
+    "qualification": ("qualification", "education", "degree"),
+    "role": ("role", "job role", "job_role", "job title"),
+}
+# Skills given as one string are split on these separators
+SKILL_SEPARATORS = re.compile(r"[,;|]")
+
+# SVC settings of the shipped model; --search tries the grid below with cross-validation instead
+DEFAULT_PARAMS = {"kernel": "rbf", "C": 1.0, "gamma": "scale"}
+PARAM_GRID = {"C": [0.1, 1, 10, 100], "gamma": ["scale", 0.01, 0.1]}
+# Profiles timed one by one for the inference latency recorded in the metadata
+LATENCY_SAMPLES = 200
+
+
+# Function to read a CSV or JSON lines dataset into dicts with lower-case keys
+def read_records(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if path.lower().endswith((".jsonl", ".json")):
+            records = [json.loads(line) for line in f if line.strip()]
+        else:
+            records = list(csv.DictReader(f))
+    return [{str(key).strip().lower(): value for key, value in record.items()} for record in records]
+
+
+def split_skills(value):
+    if isinstance(value, str):
+        value = SKILL_SEPARATORS.split(value)
+    return [skill.strip().lower() for skill in value or [] if skill and skill.strip()]
+
+
+# Numbers are taken as years; text ("2 years", "6 months", "0-2") goes through the same parsing as resumes
+def experience_years(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float(convert_experience(value))
+
+
+# Function to load (skills, experience, qualification, role) rows; rows without a role are skipped
+def load_dataset(path):
+    records = read_records(path)
+    if not records:
+        raise ValueError(f"No rows in {path}")
+    columns = {}
+    for field, names in FIELD_NAMES.items():
+        column = next((name for name in names if name in records[0]), None)
+        if column is None:
+            raise ValueError(f"{path} has no {field} column (expected one of: {', '.join(names)})")
+        columns[field] = column
+
+    rows = []
+    for record in records:
+        role = str(record.get(columns["role"]) or "").strip()
+        if role:
+            rows.append((split_skills(record.get(columns["skills"])), record.get(columns["experience"]),
+                         record.get(columns["qualification"]) or "", role))
+    return rows
+
+
+# Function to fit the binarizer and encoders and build the sparse feature matrix: one column
+# per skill, then NUMERIC_FEATURES, the same layout job_role_prediction builds at inference
+def build_features(rows):
+    mlb = MultiLabelBinarizer(sparse_output=True)
+    skills = mlb.fit_transform([skills for skills, _, _, _ in rows]).tocsr()
+
+    # Fitted on every label the extractors can return, so no resume maps to an unknown one
+    degree_encoder = LabelEncoder().fit(DEGREE_LABELS)
+    domain_encoder = LabelEncoder().fit(DOMAIN_LABELS)
+    job_encoder = LabelEncoder().fit([role for _, _, _, role in rows])
+
+    numeric = np.column_stack([
+        [experience_years(experience) for _, experience, _, _ in rows],
+        degree_encoder.transform([extract_degree(qualification) for _, _, qualification, _ in rows]),
+        domain_encoder.transform([extract_domain(qualification) for _, _, qualification, _ in rows]),
+    ]).astype(np.float64)
+
+    features = sparse.hstack([skills.astype(np.float64), sparse.csr_matrix(numeric)], format="csr")
+    labels = job_encoder.transform([role for _, _, _, role in rows])
+    encoders = {"mlb": mlb, "degree_encoder": degree_encoder, "domain_encoder": domain_encoder,
+                "job_encoder": job_encoder}
+    return features, labels, encoders
+
+
+# Function to fit the SVC. SVC itself is single threaded, so n_jobs parallelises the
+# cross-validation folds (and the grid search candidates with search=True)
+def fit_model(features, labels, params=None, search=False, cv=5, n_jobs=None):
+    params = dict(DEFAULT_PARAMS, **(params or {}))
+    report = {}
+    start = time.perf_counter()
+    if search:
+        grid = GridSearchCV(SVC(**params), PARAM_GRID, cv=cv, n_jobs=n_jobs)
+        grid.fit(features, labels)
+        params.update(grid.best_params_)
+        report.update(cv_accuracy=float(grid.best_score_), search_seconds=time.perf_counter() - start)
+    elif cv and cv > 1:
+        scores = cross_val_score(SVC(**params), features, labels, cv=cv, n_jobs=n_jobs)
+        report.update(cv_accuracy=float(scores.mean()), cv_seconds=time.perf_counter() - start)
+
+    model = SVC(**params)
+    start = time.perf_counter()
+    model.fit(features, labels)
+    report["train_seconds"] = time.perf_counter() - start
+    report["train_accuracy"] = float(model.score(features, labels))
+    return model, report
+
+
+# Function to time the model the way the app calls it: dense rows, one profile at a time and in one batch
+def measure_latency(model, features, samples=LATENCY_SAMPLES):
+    rows = features[:samples].toarray()
+    timings = []
+    for row in rows:
+        start = time.perf_counter()
+        model.decision_function(row[None, :])
+        timings.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    model.decision_function(rows)
+    batch_seconds = time.perf_counter() - start
+    return {
+        "inference_ms_p50": float(np.percentile(timings, 50)) * 1000,
+        "inference_ms_p95": float(np.percentile(timings, 95)) * 1000,
+        "batch_ms_per_profile": batch_seconds / len(rows) * 1000,
+    }
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Function to write the artifacts and their metadata. Every file is written next to its final name
+# and renamed over it so no reader sees a partly written file; the metadata goes last
+def save_artifacts(artifacts, metadata, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    for name, value in artifacts.items():
+        path = model_registry.artifact_path(name, out_dir)
+        joblib.dump(value, path + ".tmp")
+        os.replace(path + ".tmp", path)
+    path = model_registry.metadata_path(out_dir)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2, default=str)
+    os.replace(path + ".tmp", path)
+
+
+# Function to train on a dataset and save the five artifacts with their metadata to out_dir
+def train(dataset, out_dir=None, version=None, params=None, search=False, cv=5, n_jobs=None, progress=sys.stderr):
+    out_dir = out_dir or model_registry.MODELS_DIR
+    rows = load_dataset(dataset)
+    features, labels, encoders = build_features(rows)
+    if progress:
+        print(f"{len(rows)} profiles, {features.shape[1]} features, {len(encoders['job_encoder'].classes_)} roles",
+              file=progress)
+
+    model, report = fit_model(features, labels, params, search, cv, n_jobs)
+    report.update(measure_latency(model, features))
+
+    created = time.time()
+    metadata = {
+        "format_version": model_registry.FORMAT_VERSION,
+        "version": version or time.strftime("%Y%m%d-%H%M%S", time.gmtime(created)),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(created)),
+        "dataset": {"file": os.path.basename(dataset), "sha256": file_sha256(dataset), "rows": len(rows)},
+        "feature_columns": list(encoders["mlb"].classes_) + NUMERIC_FEATURES,
+        "job_roles": encoders["job_encoder"].classes_.tolist(),
+        "degrees": encoders["degree_encoder"].classes_.tolist(),
+        "domains": encoders["domain_encoder"].classes_.tolist(),
+        "model": {"class": type(model).__name__, "params": model.get_params()},
+        "python": platform.python_version(),
+        "sklearn": sklearn.__version__,
+        "metrics": report,
+    }
+    save_artifacts(dict(encoders, model=model), metadata, out_dir)
+    return metadata
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the job role model and write the models/ artifacts")
+    parser.add_argument("dataset", help="CSV or JSON lines file with skills, experience, qualification and role")
+    parser.add_argument("-o", "--output", default=model_registry.MODELS_DIR, help="directory for the artifacts")
+    parser.add_argument("--version", help="version recorded in the metadata (default: the training time)")
+    parser.add_argument("-C", type=float, default=DEFAULT_PARAMS["C"], help="SVC regularisation")
+    parser.add_argument("--search", action="store_true", help="pick C and gamma by grid search")
+    parser.add_argument("--cv", type=int, default=5, help="cross-validation folds (0 to skip)")
+    parser.add_argument("-j", "--jobs", type=int, default=-1, help="parallel cross-validation fits (-1: one per CPU)")
+    args = parser.parse_args()
+
+    metadata = train(args.dataset, args.output, args.version, {"C": args.C}, args.search, args.cv, args.jobs)
+    print(json.dumps({"version": metadata["version"], **metadata["metrics"]}, indent=2))
@@ -0,0 +1,77 @@
+import gc
+import logging
+import os
+import time
+
+import model_registry
+
+# Load the models (and optionally spaCy) in the master process before gunicorn forks, so every
+# worker shares the same pages copy-on-write instead of loading its own copy
+PRELOAD_MODELS = os.environ.get("PRELOAD_MODELS", "1").lower() in ("1", "true", "yes", "on")
+# Resume parsing no longer needs spaCy; preload it only if something else in the deployment does
+PRELOAD_SPACY = os.environ.get("PRELOAD_SPACY", "").lower() in ("1", "true", "yes", "on")
+WARM_UP = os.environ.get("WARM_UP", "1").lower() in ("1", "true", "yes", "on")
+
+# A made-up resume used to run every stage once before the first request
+WARM_UP_RESUME = """Jane Doe
+jane.doe@example.com
+SKILLS
+Python, Java, SQL, Docker, AWS, Machine Learning, React
+EDUCATION
+BTech in Computer Science
+EXPERIENCE
+Software Engineer, Acme Corp   Jan 2019 - Dec 2022
+"""
+
+logger = logging.getLogger(__name__)
+
+
+# Function to run one resume through extraction, prediction and ranking so that lazily built state
+# (keyword regexes, feature layout, sklearn internals) exists before the workers fork
+def warm_up():
+    import job_role_prediction
+    import linkdin_jobs
+    import resume_extract
+    import scoring
+
+    start = time.perf_counter()
+    info = resume_extract.extract_resume_info(WARM_UP_RESUME)
+    job_roles = job_role_prediction.predict_top_job_roles(info['Skills'], info['Experience'], info['Qualification'])
+    linkdin_jobs.extract_skills_and_qualifications({"General Information": [WARM_UP_RESUME]})
+    scoring.rank_postings([{"Skills": info['Skills'], "Qualification Match": 1, "Skill Match": len(info['Skills'])}],
+                          info['Skills'])
+    return {"job_roles": job_roles, "seconds": time.perf_counter() - start}
+
+
+# Function to start the threads each serving process needs once it runs on its own: the job store
+# refresher when REFRESH_IN_APP is set. Under gunicorn this is called from post_fork, since threads
+# started in the master would not survive the fork
+def start_background():
+    import refresher
+
+    if refresher.REFRESH_IN_APP and refresher.start_in_app() is not None:
+        logger.info("Job store refresher started")
+
+
+# WSGI app factory: preload and warm up, then hand back the Flask app. Pass background=True when
+# the app is served from this process instead of from forked workers
+def create_app(preload=PRELOAD_MODELS, preload_spacy=PRELOAD_SPACY, run_warm_up=WARM_UP, background=False):
+    from app import app
+
+    if preload:
+        stats = model_registry.preload(include_nlp=preload_spacy)
+        logger.info("Preloaded models in %.2fs, %.1f MB resident", stats["total_seconds"], stats["resident_memory_mb"])
+    if run_warm_up:
+        result = warm_up()
+        logger.info("Warm-up inference took %.3fs (%s)", result["seconds"], result["job_roles"][0][0])
+
+    # Everything loaded so far lives for the whole process; moving it out of the collector's
+    # generations keeps garbage collection in the workers from touching (and copying) those pages
+    gc.collect()
+    gc.freeze()
+    if background:
+        start_background()
+    return app
+
+
+application = create_app()